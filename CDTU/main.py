@@ -13,40 +13,99 @@ Version: 0.0.2
 LICENSE: GNU General Public License v3.0
 """
 
+import os
 import sys
 import time
 import select
 import neopixel
+import micropython
+from micropython import const
 from machine import UART, Pin
 
 """ 参数定义 """
 # 允许的波特率与信道号
 # 此处挑选效率最高的选项，同时确保处于业余无线电频段
-VALID_BAUD = {2400, 9600, 38400, 115200}
-VALID_CHAN = {f"{i:03d}" for i in range(1, 17)}
+VALID_BAUD = frozenset((2400, 9600, 38400, 115200))
+VALID_CHAN = frozenset((
+    "001", "002", "003", "004", "005", "006", "007", "008",
+    "009", "010", "011", "012", "013", "014", "015", "016",
+))
+
+# 波特率与其配置文件字符串的双向映射，避免反复进行整数与字符串的转换
+BAUD_TO_STR = {baud: str(baud) for baud in VALID_BAUD}
+STR_TO_BAUD = {baud_str: baud for baud, baud_str in BAUD_TO_STR.items()}
+
+# 预先编码的AT指令，避免每次发送时格式化字符串并编码
+AT_CMD_PROBE = b"AT\r\n"
+AT_CMD_QUERY_ALL = b"AT+RX\r\n"
+AT_CMD_SET_BAUD = {baud: b"AT+B" + baud_str.encode() + b"\r\n" for baud, baud_str in BAUD_TO_STR.items()}
+AT_CMD_SET_CHAN = {chan: b"AT+C" + chan.encode() + b"\r\n" for chan in VALID_CHAN}
 
 # AT 参数定义
 AT_MODE_ENTRY_DELAY_S = 0.05  # 进入AT模式需要的稳定时间
 AT_MODE_EXIT_DELAY_S = 0.1    # 退出AT模式后模块重启时间
-AT_CMD_INTERVAL_S = 0.1       # 发送AT指令后所需等待时间
+AT_RESPONSE_IDLE_MS = 30      # 单行应答以完整行结束后，判定应答结束所需的静默时间
+AT_QUERY_PREFIX = b"AT+R"     # 查询指令前缀，其应答为多行，行间间隔随波特率变化，需读取至超时为止
+
+# 主循环无事件时的最长等待时间，同时决定 LED 闪烁状态的更新粒度
+LOOP_IDLE_MS = const(10)
 
 # 硬件引脚定义
 CTRL_PIN = Pin(6, Pin.OUT)
 UART_TX_PIN = Pin(4)
 UART_RX_PIN = Pin(5)
-UART_ID = 1
+UART_ID = const(1)
+
+# 缓冲区大小定义
+UART_RX_BUF_SIZE = const(256)   # 串口接收缓冲区与转发缓冲区大小
+USB_LINE_BUF_SIZE = const(256)  # USB 单行读取缓冲区大小
+AT_RESPONSE_BUF_SIZE = const(256)  # AT 指令应答缓冲区大小
 
 # LED 颜色定义 (R, G, B)
 COLOR_STANDBY = (16, 0, 0)  # 待机 - 红色
 COLOR_USB_RX = (0, 16, 0)   # 收到上位机(USB)数据 - 绿色
 COLOR_UART_RX = (0, 0, 16)  # 收到串口(无线模块)数据 - 蓝色
 
+# 调试信息的文本帧包装
+LOG_PREFIX = b"** "
+LOG_SUFFIX = b" **\n"
+
+# 预先编码的固定提示信息，避免每次输出时重新进行 UTF-8 编码
+MSG_CONFIG_NOT_FOUND = "[注意] 配置文件未找到，将使用默认配置".encode("utf-8")
+MSG_CONFIG_INVALID = "[错误] 配置文件值无效，将使用默认配置".encode("utf-8")
+MSG_AT_UNREACHABLE = "[错误] 无法与模块建立AT通信".encode("utf-8")
+MSG_DECODE_FAILED = "[错误] 解码失败：指令包含非 ASCII 字符".encode("utf-8")
+MSG_EXIT_REQUESTED = "[注意] 收发信机受控退出运行".encode("utf-8")
+MSG_TERMINATED = "[提示] 程序终止".encode("utf-8")
+
 # 配置文件名
-CONFIG_FILE = "config.ini"
+# 使用绝对路径，使从 ROMFS 导入的字节码模块也能定位到可写文件系统上的配置
+CONFIG_FILE = "/config.ini"
+CONFIG_FILE_TMP = CONFIG_FILE + ".tmp"
 
 # 上电时进入AT指令模式的固定通信参数
 POWER_ON_AT_MODE_BAUD_RATE = 9600
 
+# AT 模式波特率的探测顺序，仅在导入时排序一次
+AT_PROBE_BAUD_RATES = tuple(sorted(VALID_BAUD | {POWER_ON_AT_MODE_BAUD_RATE}))
+
+# AT 应答缓冲区及其等待用的 poll 对象
+at_resp_buf = bytearray(AT_RESPONSE_BUF_SIZE)
+at_resp_mv = memoryview(at_resp_buf)
+at_poll = select.poll()
+
+# USB 行读取缓冲区，预先分配以避免逐字节拼接
+_usb_buf = bytearray(USB_LINE_BUF_SIZE)
+_usb_mv = memoryview(_usb_buf)
+_usb_byte = bytearray(1)
+
+# 缓存标准输出的写方法，并将同一轮循环内的调试信息合并为一次 USB 传输
+_stdout_write = sys.stdout.buffer.write
+_log_buf = bytearray()
+
+# 配置文件内容缓存，None 表示尚未读取
+config_cache = None
+
 # 当前模块的运行波特率
 current_baud_rate = 0 
 
@@ -60,8 +119,8 @@ class StatusLED:
         self.np = neopixel.NeoPixel(Pin(pin), 1)
         self.flash_duration_ms = flash_duration_ms
         
-        # 记录上次颜色改变的时间戳
-        self.last_change_time = 0
+        # 记录闪烁结束的截止时间戳
+        self.deadline = 0
         self.is_flashing = False
 
         # 设置初始待机颜色
@@ -75,26 +134,34 @@ class StatusLED:
     def trigger_flash(self, flash_color):
         """触发一次指定颜色的闪烁"""
         self.set_color(flash_color)
-        self.last_change_time = time.ticks_ms()
+        self.deadline = time.ticks_add(time.ticks_ms(), self.flash_duration_ms)
         self.is_flashing = True
 
+    @micropython.native
     def update(self):
         """在主循环中不断调用此方法来更新LED状态"""
         # 仅当LED处于闪烁状态时才需要检查
         if self.is_flashing:
-            # 如果距离上次闪烁已经超过了设定的时间
-            if time.ticks_diff(time.ticks_ms(), self.last_change_time) > self.flash_duration_ms:
+            # 如果已经到达闪烁的截止时间
+            if time.ticks_diff(time.ticks_ms(), self.deadline) >= 0:
                 self.set_color(COLOR_STANDBY)
                 self.is_flashing = False
                 
 """ 函数定义 """
-# 验证波特率是否有效
-def is_valid_baud(baud):
-    return baud in VALID_BAUD
-
-# 验证信道号是否有效
-def is_valid_chan(chan):
-    return chan in VALID_CHAN
+# 解析 config.ini 并缓存结果，仅在首次调用时读取闪存
+# 文件不存在时抛出 OSError 且不缓存，由调用方处理
+def load_config_file():
+    global config_cache
+    if config_cache is None:
+        config = {}
+        with open(CONFIG_FILE, "r") as f:
+            for line in f:
+                # 单次扫描切分键值，不含等号的行直接跳过
+                k, sep, v = line.strip().partition('=')
+                if sep:
+                    config[k] = v
+        config_cache = config
+    return config_cache
 
 # 从 config.ini 读取配置
 def read_config():
@@ -102,53 +169,50 @@ def read_config():
     default_chan = "006"
 
     try:
-        # 打开配置文件
-        with open(CONFIG_FILE, "r") as f:
-            config_data = {}
-            # 设置配置格式
-            for line in f:
-                if '=' in line:
-                    key, value = line.strip().split('=', 1)
-                    config_data[key] = value
-
-            # 读取字段值
-            baud_str = config_data.get("baud")
-            chan_str = config_data.get("chan")
-            baud = int(baud_str) if baud_str else None
-            chan = str(chan_str) if chan_str else None
-            
-            # 验证读取到的值
-            if baud and is_valid_baud(baud) and chan and is_valid_chan(chan):
-                return baud, chan
-            else:
-                raise ValueError("Invalid config parameters")
+        # 读取配置文件
+        config_data = load_config_file()
+
+        # 读取字段值
+        baud_str = config_data.get("baud")
+        chan_str = config_data.get("chan")
+        baud = STR_TO_BAUD.get(baud_str)
+        chan = str(chan_str) if chan_str else None
+        
+        # 验证读取到的值，能在映射表中找到的波特率即为有效值
+        if baud and chan in VALID_CHAN:
+            return baud, chan
+        else:
+            raise ValueError("Invalid config parameters")
 
     # 处理文件不存在或内容无效的情况
     except (OSError, ValueError) as e:
         if isinstance(e, OSError):
-            usb_log("** [注意] 配置文件未找到，将使用默认配置 **\n")
+            usb_log(MSG_CONFIG_NOT_FOUND)
         else:
-            usb_log("** [错误] 配置文件值无效，将使用默认配置 **\n")
+            usb_log(MSG_CONFIG_INVALID)
         
         update_config(default_baud, default_chan)
         return default_baud, default_chan
     # 处理其他异常错误
     except Exception as e:
-        usb_log(f"** [错误] 配置文件读取异常，将使用默认配置: {e} **\n")
+        usb_log(f"[错误] 配置文件读取异常，将使用默认配置: {e}")
         return default_baud, default_chan
 
 # 更新 config.ini 文件
 def update_config(baud=None, chan=None):
-    config = {}
+    global config_cache
+
+    # 快速路径：缓存已就绪且参数与缓存一致时直接返回，不复制字典也不触碰文件系统
+    if config_cache is not None \
+            and (baud is None or config_cache.get("baud") == BAUD_TO_STR.get(baud)) \
+            and (chan is None or config_cache.get("chan") == chan):
+        return
+
     changed = False
 
-    # 读取先前的配置
+    # 读取先前的配置，复制一份以免写入失败时缓存与文件不一致
     try:
-        with open(CONFIG_FILE, "r") as f:
-            for line in f:
-                if '=' in line:
-                    k, v = line.strip().split('=', 1)
-                    config[k] = v
+        config = dict(load_config_file())
 
     # 配置文件不存在
     except OSError:
@@ -156,13 +220,14 @@ def update_config(baud=None, chan=None):
         changed = True
 
     # 判断是否需要更新波特率
-    if baud is not None and is_valid_baud(baud):
-        if config.get("baud") != str(baud):
-            config["baud"] = str(baud)
+    baud_str = BAUD_TO_STR.get(baud)
+    if baud_str is not None:
+        if config.get("baud") != baud_str:
+            config["baud"] = baud_str
             changed = True
 
     # 判断是否需要更新信道号
-    if chan is not None and is_valid_chan(chan):
+    if chan in VALID_CHAN:
         if config.get("chan") != chan:
             config["chan"] = chan
             changed = True
@@ -171,36 +236,60 @@ def update_config(baud=None, chan=None):
     if not changed:
         return
 
-    # 尝试写回配置文件
+    # 序列化为一次性写入的字节串
+    blob = "".join(f"{k}={v}\n" for k, v in config.items()).encode()
+
+    # 尝试写回配置文件，先写入临时文件再原子替换，避免掉电时配置文件损坏
     try:
-        with open(CONFIG_FILE, "w") as f:
-            for k, v in config.items():
-                f.write(f"{k}={v}\n")
+        with open(CONFIG_FILE_TMP, "wb") as f:
+            f.write(blob)
+        os.rename(CONFIG_FILE_TMP, CONFIG_FILE)
+        config_cache = config
     except OSError as e:
-        usb_log(f"** [错误] 配置文件更新失败: {e} **\n")
+        usb_log(f"[错误] 配置文件更新失败: {e}")
 
 
 # 初始化/重新初始化 UART
 def init_uart(baud):
     try:
-        return UART(UART_ID, baudrate=baud, tx=UART_TX_PIN, rx=UART_RX_PIN, rxbuf=256)
+        return UART(UART_ID, baudrate=baud, tx=UART_TX_PIN, rx=UART_RX_PIN, rxbuf=UART_RX_BUF_SIZE)
+    except Exception as e:
+        # 串口不可用时程序可能随后出错，立即写出诊断信息
+        usb_log(f"[错误] 初始化 UART 时出错: {e}")
+        usb_flush_log()
+        return None
+
+# 将已有串口就地重新配置为指定波特率，避免销毁并重建串口对象
+def reconfigure_uart(uart, baud):
+    if uart is None:
+        return init_uart(baud)
+    try:
+        uart.init(baudrate=baud, tx=UART_TX_PIN, rx=UART_RX_PIN, rxbuf=UART_RX_BUF_SIZE)
+        return uart
     except Exception as e:
-        usb_log(f"** [错误] 初始化 UART 时出错: {e} **\n")
+        usb_log(f"[错误] 重新配置 UART 时出错: {e}")
+        usb_flush_log()
         return None
 
 # 向USB串口写入原始二进制数据
+# 直接写出支持缓冲区协议的对象，memoryview 切片与源缓冲区共享内存而无需复制
 def usb_raw(data):
-    if isinstance(data, bytearray):
-        data = bytes(data)
-    elif not isinstance(data, bytes):
-        raise TypeError("** [错误] RAW 函数需要字节或字节数组 **\n")
-    sys.stdout.buffer.write(data)
+    _stdout_write(data)
 
-# 向USB串口写入 UTF-8 编码的调试或提示信息
+# 将 UTF-8 编码的调试或提示信息添加文本帧包装后暂存，由 usb_flush_log 统一写出
+# 已编码的字节串（如预先编码的固定提示信息）直接写入，仅对动态生成的字符串进行编码
 def usb_log(message):
     if not isinstance(message, bytes):
         message = str(message).encode("utf-8")
-    sys.stdout.buffer.write(message)
+    _log_buf.extend(LOG_PREFIX)
+    _log_buf.extend(message)
+    _log_buf.extend(LOG_SUFFIX)
+
+# 将暂存的调试信息一次性写入USB串口
+def usb_flush_log():
+    if _log_buf:
+        _stdout_write(_log_buf)
+        _log_buf[:] = b""
 
 # 进入AT指令模式
 def enter_at_mode():
@@ -214,96 +303,144 @@ def exit_at_mode():
 
 # 发送AT指令并读取响应
 def send_at_command(uart, cmd, response_timeout=300, silent=False):
-    while uart.any():
-        uart.read()
+    # 将循环中用到的方法绑定为局部变量，避免每次迭代进行全局与属性查找
+    ticks_ms = time.ticks_ms
+    ticks_diff = time.ticks_diff
+    uart_any = uart.any
+    uart_read = uart.read
+    uart_readinto = uart.readinto
+    poll_wait = at_poll.poll
+    resp_buf = at_resp_buf
+    resp_mv = at_resp_mv
+
+    while uart_any():
+        uart_read()
     
-    uart.write(cmd.encode() if isinstance(cmd, str) else cmd)
-    time.sleep(AT_CMD_INTERVAL_S)
+    cmd = cmd.encode() if isinstance(cmd, str) else cmd
+    uart.write(cmd)
+
+    # 仅单行应答在行结束后提前返回，多行的查询应答读取至超时，以免在低波特率下截断后续行
+    early_finish = not cmd.startswith(AT_QUERY_PREFIX)
     
-    response = b''
-    start_time = time.ticks_ms()
-    while time.ticks_diff(time.ticks_ms(), start_time) < response_timeout:
-        data = uart.read()
-        if data:
-            response += data
+    # 由 poll 阻塞等待串口数据到达，直接读入预分配的应答缓冲区
+    at_poll.register(uart, select.POLLIN)
+    n = 0
+    start_time = ticks_ms()
+    while n < AT_RESPONSE_BUF_SIZE:
+        remaining = response_timeout - ticks_diff(ticks_ms(), start_time)
+        if remaining <= 0:
+            break
+        # 应答已以完整行结束时，仅再等待一个静默间隔，期间无后续数据即提前结束
+        line_ended = early_finish and n > 0 and resp_buf[n - 1] == 0x0A
+        if not poll_wait(min(remaining, AT_RESPONSE_IDLE_MS) if line_ended else remaining):
+            if line_ended:
+                break
+            continue
+        n += uart_readinto(resp_mv[n:]) or 0
+    at_poll.unregister(uart)
+    response = bytes(at_resp_mv[:n])
     
     if not silent and response.strip():
         display_response = response.strip().replace(b'\r\n', b' ').replace(b'\n', b' ')
-        usb_log(f"** {display_response} **\n")
+        usb_log(display_response)
 
     return response
 
+# 生成波特率尝试顺序，优先尝试上次已知的波特率
+def at_probe_order(last_known_baud):
+    yield last_known_baud
+    for baud in AT_PROBE_BAUD_RATES:
+        if baud != last_known_baud:
+            yield baud
+
+# 在同一 AT 模式窗口内依次发送一组AT指令，每条指令收到应答后立即发送下一条
+def send_at_batch(uart, cmds, silent=False):
+    return [send_at_command(uart, cmd, silent=silent) for cmd in cmds]
+
 # 探测 AT 模式的正确波特率
-def find_at_baud_rate(last_known_baud,silent=False):
-    
-    # 定义波特率尝试列表
-    baud_rates_to_try = list(dict.fromkeys([last_known_baud] + sorted(list(VALID_BAUD) + [POWER_ON_AT_MODE_BAUD_RATE])))
+# 全程复用同一个串口对象（可传入现有串口），每次尝试仅重新配置波特率
+def find_at_baud_rate(last_known_baud,silent=False,uart=None):
     
     # 尝试进行探测
-    for baud in baud_rates_to_try:
-        uart = init_uart(baud)
+    for baud in at_probe_order(last_known_baud):
+        uart = reconfigure_uart(uart, baud)
         
-        # 首先确保 uart 对象被成功创建
+        # 首先确保 uart 对象可用
         if uart: 
-            response = send_at_command(uart, "AT\r\n", response_timeout=200, silent=True)
+            response = send_at_command(uart, AT_CMD_PROBE, response_timeout=200, silent=True)
             
             # 然后判断 response 是否有效且正确
             if response and response.strip().endswith(b'OK'):
-                return uart  # 成功，直接返回，不关闭串口
-            else:
-                uart.deinit() # 失败，关闭这个没用的串口，继续下一次循环
+                return uart, baud  # 成功，直接返回串口及其波特率
 
     # 如果所有尝试都失败了
-    usb_log("** [错误] 无法与模块建立AT通信 **\n")
-    return init_uart(POWER_ON_AT_MODE_BAUD_RATE)
+    usb_log(MSG_AT_UNREACHABLE)
+    usb_flush_log()
+    return reconfigure_uart(uart, POWER_ON_AT_MODE_BAUD_RATE), POWER_ON_AT_MODE_BAUD_RATE
+
+# 退出 AT 模式后取得透明传输串口
+# 探测所得串口已处于运行波特率时直接复用，仅在波特率不同时才重新配置
+def restore_uart(at_uart, at_baud):
+    if at_uart and at_baud == current_baud_rate:
+        return at_uart
+    return reconfigure_uart(at_uart, current_baud_rate)
+
+# 处理波特率指令
+def parse_baud_command(clean_cmd):
+    baud = int(clean_cmd[4:])
+    # 验证有效性然后交付处理
+    if baud in VALID_BAUD:
+        return "config", "baud", baud
+    else:
+        usb_log(f"[错误] 波特率无效: {baud}")
+        return "error", "InvalidBaud", baud
+
+# 处理信道指令
+def parse_chan_command(clean_cmd):
+    val_str = clean_cmd[4:].decode()
+    # 验证有效性然后交付处理，长度不为 3 的输入直接判为无效，无需计算哈希
+    if len(val_str) == 3 and val_str in VALID_CHAN:
+        return "config", "chan", val_str
+    else:
+        usb_log(f"[错误] 信道号无效: {val_str}")
+        return "error", "InvalidChannel", val_str
+
+# 处理查询指令
+def parse_query_command(clean_cmd):
+    return "query", clean_cmd.decode(), None
+
+# 处理退出指令
+def parse_exit_command(clean_cmd):
+    if clean_cmd == b"AT+EXIT":
+        return "control", "exit", None
+    return parse_unknown_command(clean_cmd)
+
+# 处理其他非配置的AT指令
+def parse_unknown_command(clean_cmd):
+    clean_text = clean_cmd.decode()
+    usb_log(f"[注意] 未知指令: {clean_text}")
+    return "unknown", clean_text, None
+
+# 指令前缀分派表，以指令前 4 个字节直接查找对应的解析函数
+AT_COMMAND_PARSERS = {
+    b"AT+B": parse_baud_command,
+    b"AT+C": parse_chan_command,
+    b"AT+R": parse_query_command,
+    b"AT+E": parse_exit_command,
+}
 
 # 解析来自USB的AT指令并更新配置
 def parse_usb_command(cmd_bytes):
     try:
-        # 按 ASCII 编码尝试解码指令
-        try:
-            text = cmd_bytes.decode("ASCII")
-        except UnicodeDecodeError:
-            usb_log("** [错误] 解码失败：指令包含非 ASCII 字符 **\n")
-            return "error", None, None
-
-        # 去除字符串两端的非预期字符
-        clean_text = text.strip()
-        
-        # 处理波特率指令
-        if clean_text.startswith("AT+B"):
-            val_str = clean_text[4:]
-            baud = int(val_str)
-            # 验证有效性然后交付处理
-            if is_valid_baud(baud):
-                return "config", "baud", baud
-            else:
-                usb_log(f"** [错误] 波特率无效: {baud} **\n")
-                return "error", "InvalidBaud", baud
-
-        # 处理信道指令
-        elif clean_text.startswith("AT+C"):
-            val_str = clean_text[4:]
-            # 验证有效性然后交付处理
-            if is_valid_chan(val_str):
-                return "config", "chan", val_str
-            else:
-                usb_log(f"** [错误] 信道号无效: {val_str} **\n")
-                return "error", "InvalidChannel", val_str
-                
-        # 处理退出指令
-        elif clean_text == "AT+EXIT":
-            return "control", "exit", None
-        
-        # 处理查询指令
-        elif clean_text.startswith(("AT+R")):
-            return "query", clean_text, None
-        
-        # 处理其他非配置的AT指令
-        else:
-            usb_log(f"** [注意] 未知指令: {clean_text} **\n")
-            return "unknown", clean_text, None
-
+        # 去除两端的非预期字符，直接在字节串上按前缀分派，无需先整体解码
+        clean_cmd = cmd_bytes.strip().upper()
+        parser = AT_COMMAND_PARSERS.get(clean_cmd[:4], parse_unknown_command)
+        return parser(clean_cmd)
+
+    # 解码异常处理
+    except UnicodeError:
+        usb_log(MSG_DECODE_FAILED)
+        return "error", None, None
     # 格式错误异常处理
     except (ValueError, IndexError) as e:
         return "error", "FormatError", str(e)
@@ -320,74 +457,103 @@ def execute_at_command(cmd_bytes, uart_obj):
 
     # 如果解析发生错误
     if cmd_type == "error":
-        usb_log(f"** [错误] 指令处理失败：{param} - {value}**\n")
+        usb_log(f"[错误] 指令处理失败：{param} - {value}")
         return uart_obj
 
     # 如果收到退出指令
     elif cmd_type == "control" and param == "exit":
         state = False
-        usb_log("** [注意] 收发信机受控退出运行 **\n")
+        usb_log(MSG_EXIT_REQUESTED)
         return uart_obj
 
     # 如果收到配置指令
     elif cmd_type == "config":
         enter_at_mode()
-        at_uart = find_at_baud_rate(current_baud_rate, True)
+        at_uart, at_baud = find_at_baud_rate(current_baud_rate, True, uart_obj)
         if param == "baud":
-            response = send_at_command(at_uart, f"AT+B{value}\r\n")
+            response = send_at_command(at_uart, AT_CMD_SET_BAUD[value])
         elif param == "chan":
-            response = send_at_command(at_uart, f"AT+C{value}\r\n")
-        
-        # 销毁临时uart对象
-        if at_uart:
-            at_uart.deinit()
-            
+            response = send_at_command(at_uart, AT_CMD_SET_CHAN[value])
+
         exit_at_mode()
 
         # 更新配置信息
         if b"OK" in response:
             update_config(**{param: value})
-            usb_log(f"** [注意] 参数 {param} 已设置为 {value} **\n")
+            usb_log(f"[注意] 参数 {param} 已设置为 {value}")
             current_baud_rate = value if param == "baud" else current_baud_rate
 
-        # 重载 UART 配置
-        new_uart = init_uart(current_baud_rate)
-        return new_uart
+        # 仅在波特率实际改变时重载 UART 配置
+        return restore_uart(at_uart, at_baud)
     
     # 如果收到查询指令
     elif cmd_type == "query":
         enter_at_mode()
-        at_uart = find_at_baud_rate(current_baud_rate,True)
+        at_uart, at_baud = find_at_baud_rate(current_baud_rate, True, uart_obj)
         send_at_command(at_uart, param + '\r\n')
         exit_at_mode()
 
-        # 销毁临时uart对象
-        if at_uart:
-            at_uart.deinit()
-        
-        # 重新初始化主串口，并返回新的对象
-        new_uart = init_uart(current_baud_rate)
-        return new_uart
+        # 查询不改变任何参数，探测使用的是同一个硬件串口，若其波特率与运行波特率一致则直接复用
+        return restore_uart(at_uart, at_baud)
 
     # 其他类型信息
     else:
         return uart_obj
 
+# 更新主循环等待对象上注册的串口，使无线模块数据到达时能唤醒主循环
+# 先注销旧串口，新串口不可用时不注册，以免无法读取的串口持续唤醒主循环
+def watch_uart(old_uart, new_uart):
+    if old_uart is not None:
+        loop_poll.unregister(old_uart)
+    if new_uart is not None:
+        loop_poll.register(new_uart, select.POLLIN)
+
+# 缓存串口的 any/readinto 绑定方法，串口对象不可用时返回恒为空的 any
+def bind_uart_methods(uart):
+    if uart is None:
+        return (lambda: 0), None
+    return uart.any, uart.readinto
+
+# 非阻塞检查 USB 串口是否有待读数据，ipoll 不会为每次检查分配结果列表
+def usb_data_ready():
+    for _ in poll.ipoll(0):
+        return True
+    return False
+
 # 从 USB 串口非阻塞地读取一行字节数据
-def usb_readline_bytes(maxlen=256):
-    line = b''
-    # 进行非阻塞检查
-    while poll.poll(0):
-        # 直接从 buffer 读取字节
-        char_byte = sys.stdin.buffer.read(1)
-        if char_byte:
-            line += char_byte
-            if char_byte == b'\n' or  len(line) >= maxlen:
-                break
-        # 无字可读时退出
-        else:
+def usb_readline_bytes(maxlen=USB_LINE_BUF_SIZE):
+    # 无数据时仅进行一次 poll 即返回，跳过后续的属性查找
+    if not usb_data_ready():
+        return b''
+    stdin = sys.stdin.buffer
+    maxlen = min(maxlen, len(_usb_buf))
+    n = 0
+    # 进行非阻塞检查，stdin 的 readinto 会阻塞至填满缓冲区，因此每次仅读取已就绪的一个字节
+    while n < maxlen and usb_data_ready():
+        # 读入单字节暂存区，避免为每个字节创建新的 bytes 对象
+        if not stdin.readinto(_usb_byte):
+            break
+        char = _usb_byte[0]
+        _usb_buf[n] = char
+        n += 1
+        if char == 0x0A:
             break
-    return line
+    return bytes(_usb_mv[:n]) if n else b''
+
+# 判断 USB 行是否为 AT 指令，直接比较前 3 个字节（前两个字节忽略大小写），不创建新的字节串
+@micropython.native
+def is_at_command(line):
+    return len(line) >= 3 and line[2] == 0x2B and (line[0] | 0x20) == 0x61 and (line[1] | 0x20) == 0x74
+
+
+# 将来自无线模块的数据转发至 USB，编译为机器码以降低主循环开销
+@micropython.native
+def forward_uart_data(readinto, buf, buf_mv):
+    n = readinto(buf)
+    if n:
+        usb_raw(buf_mv[:n])
+        # 更新指示灯状态
+        led.trigger_flash(COLOR_UART_RX)
 
 
 """ 上电初始化 """
@@ -405,44 +571,51 @@ current_baud_rate = target_baud
 enter_at_mode()
 
 # 自动探测并找到正确的AT通信波特率，返回一个可用的 uart 对象
-at_serial = find_at_baud_rate(target_baud,True)
+at_serial, at_baud = find_at_baud_rate(target_baud,True)
 
-# 使用探测成功的 uart 对象来发送配置指令
-usb_log(f"** [调试] 波特率将设置为 {target_baud} **\n")
-send_at_command(at_serial, f"AT+B{target_baud}\r\n")
-usb_log(f"** [调试] 信道号将设置为 {target_chan} **\n")
-send_at_command(at_serial, f"AT+C{target_chan}\r\n")
-usb_log("** [调试] 读取最终设置... **\n")
-send_at_command(at_serial, "AT+RX\r\n")
+# 使用探测成功的 uart 对象，在一次 AT 模式窗口内批量发送配置与查询指令
+usb_log(f"[调试] 波特率将设置为 {target_baud}，信道号将设置为 {target_chan}，随后读取最终设置...")
+usb_flush_log()
+send_at_batch(at_serial, (AT_CMD_SET_BAUD[target_baud], AT_CMD_SET_CHAN[target_chan], AT_CMD_QUERY_ALL))
 
 # 退出 AT 模式
 exit_at_mode()
-at_serial.deinit()
 
-# 初始化用于透明传输的串口，并更新全局波特率变量
-serial = init_uart(target_baud)
+# 更新全局波特率变量，并取得用于透明传输的串口
 current_baud_rate = target_baud
+serial = restore_uart(at_serial, at_baud)
+usb_flush_log()
 
 """ 轮询逻辑 """
 # 仅使用 poll 监控 sys.stdin，以规避固件Bug
+# 该对象专用于非阻塞读取 USB 行，不注册串口，以免串口就绪被误判为 USB 有数据
 poll = select.poll()
 poll.register(sys.stdin, select.POLLIN)
 
-# 分配缓冲区
-buf = bytearray(256)
+# 主循环的等待对象，同时监控 USB 与串口，任一侧有数据时立即唤醒，空闲时让出 CPU
+loop_poll = select.poll()
+loop_poll.register(sys.stdin, select.POLLIN)
+watch_uart(None, serial)
+
+# 分配缓冲区及其共享视图
+buf = bytearray(UART_RX_BUF_SIZE)
+buf_mv = memoryview(buf)
+
+# 在循环外缓存串口方法，避免每次迭代进行属性查找
+serial_any, serial_readinto = bind_uart_methods(serial)
 
 while state:
+    # 阻塞等待任一侧数据到达，超时后继续以便更新 LED 状态，ipoll 不会分配结果列表
+    for _ in loop_poll.ipoll(LOOP_IDLE_MS):
+        break
+
     try:
         # 优先处理来自无线模块的数据
         try:
-            if serial and hasattr(serial, "readinto") and serial.any():
-                n = serial.readinto(buf)
-                if n is not None and n > 0:
-                    usb_raw(buf[:n])
-                    # 更新指示灯状态
-                    led.trigger_flash(COLOR_UART_RX)
+            if serial_any():
+                forward_uart_data(serial_readinto, buf, buf_mv)
         except Exception as e:
-            usb_log(f"** [错误] 处理来自无线模块的数据时发生错误：{repr(e)} **\n")
+            usb_log(f"[错误] 处理来自无线模块的数据时发生错误：{repr(e)}")
 
         # 然后处理来自USB的数据
         usb_line = usb_readline_bytes()
@@ -450,30 +623,40 @@ while state:
             # 更新指示灯状态
             led.trigger_flash(COLOR_USB_RX)
             # 检查是否为AT指令
-            if usb_line.strip().upper().startswith(b'AT+'):
+            if is_at_command(usb_line):
                 # 调用修改后的AT指令处理函数
+                previous_serial = serial
                 serial = execute_at_command(usb_line, serial)
+                serial_any, serial_readinto = bind_uart_methods(serial)
+                watch_uart(previous_serial, serial)
             else:
                 # 作为透明数据直接转发
                 try:
                     serial.write(usb_line)
                 except Exception as e:
-                    usb_log(f"** [错误] 转发时发生错误：{e} **\n")
+                    usb_log(f"[错误] 转发时发生错误：{e}")
 
     # 其他情况处理
     except KeyboardInterrupt:
         break
     except Exception as e:
-        usb_log(f"** [错误] 轮询逻辑发生错误：{e} **\n")
+        usb_log(f"[错误] 轮询逻辑发生错误：{e}")
         time.sleep(1)
         
-    # 更新 LED 状态
-    led.update()
+    # 仅在闪烁期间更新 LED 状态，空闲时跳过方法调用
+    if led.is_flashing:
+        led.update()
+
+    # 写出本轮循环中产生的调试信息
+    usb_flush_log()
 
 """ 程序退出清理 """
 if serial:
+    loop_poll.unregister(serial)
     serial.deinit()
 poll.unregister(sys.stdin)
+loop_poll.unregister(sys.stdin)
 CTRL_PIN.value(1)
 led.set_color((0,0,0))
-usb_log("** [提示] 程序终止 **\n")
\ No newline at end of file
+usb_log(MSG_TERMINATED)
+usb_flush_log()
\ No newline at end of file
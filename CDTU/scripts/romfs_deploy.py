@@ -0,0 +1,53 @@
+"""
+ROMFS deploy script for HAB Transceiver.
+
+This script precompiles main.py into MicroPython bytecode with mpy-cross,
+packs it into a ROMFS image and deploys it to the board with mpremote,
+so the VM executes the bytecode in place from flash instead of compiling
+the source into RAM at every boot.
+
+Usage: python scripts/romfs_deploy.py [mpremote device args...]
+"""
+
+import os
+import sys
+import subprocess
+
+# 路径定义
+CDTU_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_FILE = os.path.join(CDTU_DIR, "main.py")
+BUILD_DIR = os.path.join(CDTU_DIR, "build")
+ROMFS_DIR = os.path.join(BUILD_DIR, "romfs")
+STUB_FILE = os.path.join(BUILD_DIR, "main.py")
+
+# ROMFS 中的模块名，不能与文件系统上的 main.py 重名，否则会导入存根自身
+MODULE_NAME = "cdtu"
+
+# 执行外部命令，失败时直接退出
+def run(args):
+    print("> " + " ".join(args))
+    subprocess.run(args, check=True)
+
+def main():
+    device_args = sys.argv[1:]
+    os.makedirs(ROMFS_DIR, exist_ok=True)
+
+    # 程序中含有 @micropython.native 函数，需指定 RP2040 (Cortex-M0+) 的目标架构
+    print("--- 预编译 main.py 为字节码 ---")
+    run(["mpy-cross", "-O3", "-march=armv6m", SOURCE_FILE, "-o", os.path.join(ROMFS_DIR, MODULE_NAME + ".mpy")])
+
+    # 生成启动存根，由文件系统上的 main.py 导入 ROMFS 中的字节码模块
+    with open(STUB_FILE, "w") as f:
+        f.write(f"import {MODULE_NAME}\n")
+
+    print("--- 构建并部署 ROMFS 镜像 ---")
+    run(["mpremote", *device_args, "romfs", "deploy", ROMFS_DIR])
+
+    # config.ini 需要在运行时写入，因此保留在可写文件系统上，不放入只读的 ROMFS
+    print("--- 上传启动存根 ---")
+    run(["mpremote", *device_args, "fs", "cp", STUB_FILE, ":main.py"])
+
+    print("--- 部署完成 ---")
+
+if __name__ == "__main__":
+    main()
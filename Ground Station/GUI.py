@@ -17,16 +17,19 @@ LICENSE: GNU General Public License v3.0
 import re
 import os
 import sys
+import queue
 import serial
+import threading
 import subprocess
+from collections import deque
 import numpy as np
 from serial.tools import list_ports
-from datetime import datetime, timezone
+from time import strftime, gmtime, monotonic
 from configparser import RawConfigParser
-from PyQt6.QtGui import QIcon, QPixmap, QColor
+from PyQt6.QtGui import QIcon, QPixmap, QColor, QImageReader
 from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtCore import Qt, QUrl, QTimer, QTime, QThread, pyqtSignal
-from PyQt6.QtWidgets import QApplication, QWidget, QLabel, QPushButton, QPlainTextEdit, QMessageBox, QComboBox, QLineEdit, QFormLayout, QHeaderView, QTableWidget, QVBoxLayout, QTableWidgetItem, QAbstractItemView, QDialog, QTabWidget, QHBoxLayout, QFileDialog
+from PyQt6.QtCore import Qt, QUrl, QSize, QTimer, QTime, QThread, pyqtSignal, QAbstractTableModel, QModelIndex
+from PyQt6.QtWidgets import QApplication, QWidget, QLabel, QPushButton, QPlainTextEdit, QMessageBox, QComboBox, QLineEdit, QFormLayout, QHeaderView, QTableWidget, QTableView, QVBoxLayout, QTableWidgetItem, QAbstractItemView, QDialog, QTabWidget, QHBoxLayout, QFileDialog
 
 # 禁用 GPU 加速
 os.environ['QTWEBENGINE_CHROMIUM_FLAGS'] = '--disable-gpu --disable-software-rasterizer'
@@ -43,22 +46,72 @@ combo_box_style = 'QComboBox { background-color: #ffffff; border: 1px solid #349
 input_box_style = 'QLineEdit { background-color: #FFFFFF; color: #3063AB; border: 1px solid #3498db; border-radius: 5px; padding: 1px; font-family: 微软雅黑; font-size: 12px; } QPlainTextEdit { background-color: #FFFFFF; color: #3063AB; border: 1px solid #3498db; border-radius: 5px; padding: 1px; font-family: 微软雅黑; font-size: 12px; } QLineEdit:disabled {background-color: #F0F0F0; color: #000000; border: 1px solid #888888;}'
 common_button_style = 'QPushButton { background-color: #3498db; color: #ffffff; border-radius: 5px; padding: 6px; font-size: 12px;} QPushButton:hover {background-color: #2980b9;} QPushButton:pressed {background-color: #21618c;}'
 
+# QSO 信息表格的行背景色
+own_message_color = QColor("#FFA07A")      # 自己发送的消息
+own_relayed_color = QColor("#FFE4EA")      # 从气球上转发回来的自己的消息
+to_me_message_color = QColor("#00BFFF")    # 发给我的消息
+cq_message_color = QColor("#EE82EE")       # 他人的 CQ
+normal_message_color = QColor("#FFFFFF")   # 其他普通消息
+
+# 状态提示帧匹配模式，解析状态码和可选的 Payload
+status_frame_pattern = re.compile(r"Code: 0x([0-9A-Fa-f]{4})(?:, Info: (.*))?")
+
+# 接收缓冲区上限，超出时丢弃最旧的数据，防止不完整帧导致缓冲区无限增长
+rx_buffer_limit = 64 * 1024
+
+# SSDV 帧头（NOFEC 模式、正常模式）与帧长度
+ssdv_nofec_header = b"\x55\x67"
+ssdv_normal_header = b"\x55\x66"
+ssdv_frame_len = 256
+
+# 所有已知有效数据包的头部，用于清除前导噪声
+known_frame_headers = (ssdv_nofec_header, ssdv_normal_header, b"**")
+
 # 处理配置文件
 config = RawConfigParser()
 config.optionxform = str
 config.read("config.ini")
 
-# 检查配置文件是否存在且包含必要信息
-def is_config_valid():
+# 更新地面站配置项，仅在取值变化时写回 config.ini
+# 先写入临时文件再原子替换，避免写入中断时留下不完整的配置文件
+def update_station_config(values):
+    if not config.has_section("GroundStation"):
+        config.add_section("GroundStation")
+
+    changed = False
+    for key, value in values.items():
+        if config.get("GroundStation", key, fallback=None) != value:
+            config.set("GroundStation", key, value)
+            changed = True
+    if not changed:
+        return False
+
+    with open("config.ini.tmp", "w") as configfile:
+        config.write(configfile)
+    os.replace("config.ini.tmp", "config.ini")
+    return True
+
+# 经纬度转梅登黑德网格
+def latlng_to_maiden(lat, lon):
+    lat += 90
+    lon += 180
+    return (
+        f"{chr(int(lon // 20) + 65)}{chr(int(lat // 10) + 65)}"
+        f"{int((lon % 20) // 2)}{int(lat % 10)}"
+        f"{chr(int((lon % 2) * 12) + 97)}{chr(int((lat % 1) * 24) + 97)}"
+    )
+
+# 从已载入的配置中一次性读取地面站信息，配置文件不存在或信息不完整时返回 None
+def read_station_config():
     try:
-        config.read('config.ini')
-        config.get("GroundStation", "Callsign")
-        config.getfloat("GroundStation", "Latitude")
-        config.getfloat("GroundStation", "Longitude")
-        config.getfloat("GroundStation", "Altitude")
-        return True
+        return (
+            config.get("GroundStation", "Callsign"),
+            config.getfloat("GroundStation", "Latitude"),
+            config.getfloat("GroundStation", "Longitude"),
+            config.getfloat("GroundStation", "Altitude"),
+        )
     except Exception:
-        return False
+        return None
 
 # 程序主窗口
 class GUI(QWidget):
@@ -100,6 +153,11 @@ class GUI(QWidget):
         self.img_num   = -1
         self.frame_num = 1
 
+        # 当前图像的 .dat 文件及其路径，在图像编号变化时才重新打开
+        self.dat_file = None
+        self.dat_filepath = ''
+        self.jpg_filepath = ''
+
         # 设置可复用的状态图标
         global standby, success, warning, failure, pending
         standby = QPixmap('UI/standby.svg')
@@ -213,14 +271,67 @@ class GUI(QWidget):
             "131076": "ERR_CAMERA_FAILED_TO_GET_FB",
         }
 
+        # 文本帧前缀与处理函数的分派表
+        self.text_frame_handlers = {
+            "$$": self.handle_telemetry_frame,
+            "##": self.handle_relay_frame,
+            "Code:": self.handle_status_frame,
+        }
+
         # 定义串口数据缓存区 (接收) 
         self.rx_buffer = bytearray()
 
+        # SSDV 帧头扫描位置，此位置之前的数据已确认不含 SSDV 帧头，无需重复查找
+        self.ssdv_scan_pos = 0
+
+        # 文本帧起始定界符扫描位置，此位置之前的数据已确认不含未处理的文本帧
+        self.text_scan_pos = 0
+
+        # 创建常驻的 SSDV 解码线程，解码完成后通过信号在主线程中更新图像；线程在配置检查完成后启动
+        self.ssdv_decoder = SsdvDecoderThread(self)
+        self.ssdv_decoder.decoding_finished.connect(self.on_decoding_finished)
+        self.ssdv_decoder.log_message.connect(self.debug_info)
+
+        # SSDV 解码合并定时器，解码需读取整幅图像的 .dat 文件，连续到达的多帧只触发一次解码
+        self.ssdv_decode_timer = QTimer(self)
+        self.ssdv_decode_timer.setSingleShot(True)
+        self.ssdv_decode_timer.setInterval(500)
+        self.ssdv_decode_timer.timeout.connect(self.submit_ssdv_decode)
+
+        # 创建 SondeHub 上传线程，避免在主线程中创建子进程；线程在配置检查完成后启动
+        self.sondehub_uploader = SondehubUploadThread(self)
+        self.sondehub_uploader.log_message.connect(self.debug_info)
+
+        # 日志文件在启动时打开一次并保持，定时刷新缓冲区以免程序异常退出时丢失记录
+        self.log_file = open("log.txt", "a", encoding="utf-8", buffering=8192)
+        self.log_flush_timer = QTimer(self)
+        self.log_flush_timer.timeout.connect(self.log_file.flush)
+        self.log_flush_timer.start(2000)
+
+        # 地图位置更新合并定时器，最多每 250 ms 向地图页面推送一次，且坐标未变化时不推送
+        self.map_update_timer = QTimer(self)
+        self.map_update_timer.setSingleShot(True)
+        self.map_update_timer.setInterval(250)
+        self.map_update_timer.timeout.connect(self.push_map_position)
+        self.last_map_coords = None
+
         # 绘制UI
         self.UI()
 
+        # 各状态图标当前显示的图像，用于跳过重复的设置
+        self.current_status_icons = {}
+
+        # 状态类别与对应状态图标的映射
+        self.status_icons = {
+            "init": self.init_status_icon,
+            "camera": self.Camera_status_icon,
+            "gps": self.GPS_status_icon,
+            "data": self.Data_status_icon,
+        }
+
         # 然后检查配置
-        if not is_config_valid():
+        station = read_station_config()
+        if station is None:
             # 配置无效，弹出设置窗口让用户设置
             QMessageBox.information(self, "欢迎", "首次运行，请先设置地面站信息。")
             
@@ -233,11 +344,7 @@ class GUI(QWidget):
 
             # 检查用户是否完成了保存
             if result == QDialog.DialogCode.Accepted:
-                config.read('config.ini')
-                self.callsign = config.get("GroundStation", "Callsign")
-                self.local_lat = config.getfloat("GroundStation", "Latitude")
-                self.local_lng = config.getfloat("GroundStation", "Longitude")
-                self.local_alt = config.getfloat("GroundStation", "Altitude")
+                # 保存时已由 update_ground_station_settings 更新地面站信息并写入配置，无需重新读取文件
                 self.debug_info("首次设置成功。")
             else:
                 QMessageBox.warning(self, "提示", "未完成基本设置，程序将退出。")
@@ -245,10 +352,13 @@ class GUI(QWidget):
                 return
         else:
             # 配置有效，加载信息
-            self.callsign = config.get("GroundStation", "Callsign")
-            self.local_lat = config.getfloat("GroundStation", "Latitude")
-            self.local_lng = config.getfloat("GroundStation", "Longitude")
-            self.local_alt = config.getfloat("GroundStation", "Altitude")
+            self.callsign, self.local_lat, self.local_lng, self.local_alt = station
+            self.grid = latlng_to_maiden(self.local_lat, self.local_lng)
+
+        # 配置检查完成后再启动后台工作线程，首次设置被取消而退出时不会留下运行中的线程
+        self.ssdv_decoder.start()
+        self.sondehub_uploader.start()
+        self.port_scanner.start()
 
     # 主窗口
     def UI(self):
@@ -304,10 +414,13 @@ class GUI(QWidget):
         self.GPS_label.move(65, 100)
         self.GPS_label.setStyleSheet(primary_text_style)
 
-        # 轨迹地图嵌入
-        self.map_view = QWebEngineView(self)
-        self.map_view.setGeometry(40, 130, 320, 240)
-        self.map_view.setUrl(QUrl("http://hab.satellites.ac.cn/map"))
+        # 轨迹地图嵌入，网页视图在首次获得 GPS 定位时才创建，此前显示占位标签
+        self.map_view = None
+        self.map_placeholder = QLabel(self)
+        self.map_placeholder.setText("等待 GPS 定位后加载地图")
+        self.map_placeholder.setGeometry(40, 130, 320, 240)
+        self.map_placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.map_placeholder.setStyleSheet(f"{tip_text_style} {qso_frame_style}")
 
         self.GPS_LAT_label = QLabel(self)
         self.GPS_LAT_label.setText("经度: ")
@@ -388,6 +501,15 @@ class GUI(QWidget):
         self.rotator_el_NUM.setText("")
         self.rotator_el_NUM.move(260, 465)
         self.rotator_el_NUM.setStyleSheet(primary_text_style)
+
+        # 数值标签使用固定宽度，延伸至所在栏的右边界，更新数值时无需重新计算尺寸
+        for label, right_edge in (
+            (self.GPS_LAT_NUM, 200), (self.GPS_LON_NUM, 360),
+            (self.GPS_ALT_NUM, 200), (self.GPS_SPD_NUM, 360),
+            (self.GPS_heading_NUM, 200), (self.GPS_SATS_NUM, 360),
+            (self.rotator_az_NUM, 200), (self.rotator_el_NUM, 360),
+        ):
+            label.setFixedWidth(right_edge - label.x())
         
         '''右栏'''
         # 系统状态指示
@@ -441,6 +563,8 @@ class GUI(QWidget):
         self.Frame_type_output.setText("暂无有效帧")
         self.Frame_type_output.move(545, 60)
         self.Frame_type_output.setStyleSheet(secondary_text_style)
+        # 固定宽度至图像区右边界，可容纳 “SSDV 图像数据帧 99999”，逐帧更新时无需重新计算尺寸
+        self.Frame_type_output.setFixedWidth(740 - self.Frame_type_output.x())
     
         # 图片接收
         self.SSDV_icon = QLabel(self)
@@ -488,21 +612,23 @@ class GUI(QWidget):
         self.DEBUG_output.setGeometry(420, 420, 330, 65)
         self.DEBUG_output.setStyleSheet(debug_box_style)
 
-        # 串口刷新定时器
-        self.Update_COM_Info()
-        self.serial_timer = QTimer(self)
-        self.serial_timer.timeout.connect(self.Update_COM_Info)
-        self.serial_timer.start(500)
+        # 串口枚举在后台线程中定时进行，仅在串口列表变化时通知主线程刷新下拉框；线程在配置检查完成后启动
+        self.port_scanner = SerialPortScanThread(self)
+        self.port_scanner.ports_changed.connect(self.Update_COM_Info)
 
     # 向调试信息框写入信息
     def debug_info(self, text):
-        time = datetime.now().strftime("%H:%M:%S")
+        time = strftime("%H:%M:%S")
         self.DEBUG_output.appendPlainText(f"{time} {text}")
         print(text)
 
     # 处理收发信机的串口数据
     def Handle_Radio_Serial_Data(self, data: bytes):
         self.rx_buffer.extend(data)
+        if len(self.rx_buffer) > rx_buffer_limit:
+            overflow = len(self.rx_buffer) - rx_buffer_limit
+            self.debug_info(f"接收缓冲区溢出，已丢弃 {overflow} 字节旧数据。")
+            self.remove_rx_data(0, overflow)
 
         # 只要缓冲区内容在一次完整的处理循环中发生了变化，就持续循环
         while True:
@@ -525,33 +651,54 @@ class GUI(QWidget):
             if not buffer_changed_this_cycle:
                 break
     
+    # 将当前图像的解码任务交给常驻的解码线程，避免阻塞 UI
+    # 提交前先写出文件缓冲区，确保解码线程读到已接收的全部帧
+    def submit_ssdv_decode(self):
+        if self.dat_file is not None:
+            try:
+                self.dat_file.flush()
+            except IOError as e:
+                self.debug_info(f"写入 SSDV 数据失败: {e}")
+        self.ssdv_decoder.submit(self.dat_filepath, self.jpg_filepath)
+
+    # 从接收缓冲区就地删除 [start, end) 范围的数据，并同步调整 SSDV 帧头与文本帧的扫描位置
+    def remove_rx_data(self, start, end):
+        del self.rx_buffer[start:end]
+        self.ssdv_scan_pos = self.shift_scan_pos(self.ssdv_scan_pos, start, end)
+        self.text_scan_pos = self.shift_scan_pos(self.text_scan_pos, start, end)
+
+    # 计算删除 [start, end) 后的扫描位置
+    @staticmethod
+    def shift_scan_pos(scan_pos, start, end):
+        if start == 0:
+            return max(0, scan_pos - end)
+        if start < scan_pos:
+            # 删除位置前后的字节可能拼接成新的帧头，从删除位置的前一字节重新扫描
+            return start - 1
+        return scan_pos
+
     # 清除缓冲区的噪声数据
     def discard_leading_garbage(self) -> bool:
         
-        # 定义所有已知有效数据包的头部
-        known_headers = [
-            b"\x55\x67",  # SSDV NOFEC 模式
-            b"\x55\x66",  # SSDV 正常模式
-            b"**"         # 文本模式
-        ]
-
         # 如果缓冲区为空，则无需操作
         if not self.rx_buffer:
             return False
 
         # 寻找第一个出现的有效包头的位置
+        # 找到某个包头后，其余包头只需在该位置之前查找（包头均为 2 字节，结束位置取 pos + 1）
         first_valid_pos = -1
-        for header in known_headers:
-            pos = self.rx_buffer.find(header)
+        search_end = len(self.rx_buffer)
+        for header in known_frame_headers:
+            pos = self.rx_buffer.find(header, 0, search_end)
             if pos != -1:
-                if first_valid_pos == -1 or pos < first_valid_pos:
-                    first_valid_pos = pos
+                first_valid_pos = pos
+                search_end = pos + 1
         
         # 情况一：缓冲区中存在至少一个有效包头
         if first_valid_pos != -1:
             if first_valid_pos > 0:
                 # self.debug_info(f"检测并丢弃 {first_valid_pos} 字节的无效数据。")
-                self.rx_buffer = self.rx_buffer[first_valid_pos:]
+                self.remove_rx_data(0, first_valid_pos)
                 return True
             else:
                 return False
@@ -560,296 +707,322 @@ class GUI(QWidget):
         else:
             if len(self.rx_buffer) > 512:
                 self.debug_info(f"已清空 {len(self.rx_buffer)} 字节噪声。")
-                self.rx_buffer.clear()
+                self.remove_rx_data(0, len(self.rx_buffer))
                 return True
             return False
 
-    # 使用正则表达式提取文本帧信息
+    # 按 ** 定界符扫描提取文本帧信息
     def Try_Extract_Text(self) -> bool:
-        current_buffer_str = bytes(self.rx_buffer)
-        original_len = len(current_buffer_str)
-        
-        # 使用 re.sub 来替换所有文本帧匹配项
-        def process_and_remove(match):
-            Text_raw = match.group(0)
+
+        # 直接以 find 查找定界符，无需调用正则引擎；已处理的帧就地删除，从原位置继续扫描
+        # 每次从上次停下的位置开始，已确认不含文本帧的数据不再重复查找
+        buffer = self.rx_buffer
+        pos = self.text_scan_pos
+        changed = False
+        while True:
+            start = buffer.find(b"**", pos)
+            if start == -1:
+                # 保留末尾 1 字节以防定界符被拆分在两次接收的数据之间
+                self.text_scan_pos = max(0, len(buffer) - 1)
+                break
+            end = buffer.find(b"**", start + 2)
+            if end == -1:
+                # 帧尚未接收完整，下次从起始定界符处继续
+                self.text_scan_pos = start
+                break
+
+            # 空帧或跨行的定界符不构成文本帧，从下一字节继续查找
+            if end == start + 2 or buffer.find(b"\n", start + 2, end) != -1:
+                pos = start + 1
+                continue
+
+            # 切片本身即为独立副本，可直接解码，无需再经 bytes() 复制一次
+            Text_raw = buffer[start + 2:end]
+            self.remove_rx_data(start, end + 2)
+            pos = start
+            changed = True
             try:
                 Text_text = Text_raw.decode("utf-8", errors="strict").strip("* ").strip()
                 # 数传状态正常，将文本数据发送到处理函数
-                self.Data_status_icon.setPixmap(success)
+                self.set_status_icon(self.Data_status_icon, success)
                 self.Processing_Text_Data(Text_text)
             except UnicodeDecodeError:
-                print(f"[警告] 文本解码失败: {Text_raw}")
-            
-            # 返回空字节串，相当于从原字符串中删除此匹配项
-            return b""
-
-        # 查找所有匹配项，并用 process_and_remove 函数的返回值替换
-        modified_buffer_str = re.sub(rb"\*\*(.+?)\*\*", process_and_remove, current_buffer_str)
+                print(f"[警告] 文本解码失败: {bytes(Text_raw)}")
 
-        if len(modified_buffer_str) < original_len:
-            self.rx_buffer = bytearray(modified_buffer_str)
-            return True
-        else:
-            return False
+        return changed
         
+    # 仅在图标变化时更新状态图标，避免每帧重复设置相同图像触发重绘
+    def set_status_icon(self, label, icon):
+        if self.current_status_icons.get(label) is not icon:
+            self.current_status_icons[label] = icon
+            label.setPixmap(icon)
+
+    # 仅在文本变化时更新标签，避免重复触发重绘；固定宽度的标签无需重新计算尺寸
+    def update_label(self, label, text, adjust=False):
+        if label.text() != text:
+            label.setText(text)
+            if adjust:
+                label.adjustSize()
+
     # 处理非图像文本数据
     def Processing_Text_Data(self, text):
 
         # 记录日志
         print(f"文本帧：{text}")
-        time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        with open("log.txt", "a", encoding="utf-8") as f:
-            f.write(f"{time}    « {text}\n")
+        # 程序退出时日志文件已关闭，此后到达的数据不再记录
+        if not self.log_file.closed:
+            time = strftime("%Y-%m-%d %H:%M:%S")
+            self.log_file.write(f"{time}    « {text}\n")
 
-        # 处理 $$ 开头的遥测数据
-        # $$CALLSIGN,Frame_Counter,HH:MM:SS,latitude,longitude,altitude,speed,sats,heading
-        if text.startswith("$$"):
-            try:
-                fields = text[2:].strip().split(",")
-                if len(fields) == 12:
-                    balloon_callsign = fields[0]                # 气球呼号
-                    telemetry_counter = fields[1]               # 帧计数
-                    self.balloon_time = fields[2]               # 球上时间
-                    new_balloon_lat = float(fields[3])          # 气球纬度
-                    new_balloon_lng = float(fields[4])          # 气球经度
-                    new_balloon_alt = float(fields[5])          # 气球高度
-                    self.balloon_spd = float(fields[6])         # 气球速度
-                    self.balloon_sats = int(fields[7])          # 卫星数量
-                    self.balloon_heading = float(fields[8])     # 气球航向
-                    self.balloon_temprature = float(fields[9])  # 球上温度
-                    self.balloon_voltage = float(fields[10])    # 球上电压
-                    self.gps_validity = fields[11]              # 定位状态
-                else:
-                    self.debug_info(f"[警告] 遥测数据格式错误: {text}")
-                    return
-            except Exception as e:
-                self.debug_info(f"遥测数据解析出错：{e}")
-                return
-            
-            # 更新 UI 显示
-            self.Frame_type_output.setText(f"基本遥测帧 {telemetry_counter}")
-            self.Frame_type_output.adjustSize()
-
-            # GPS 有效性检查
-            if self.gps_validity == "A":
-                self.debug_info(f"遥测数据已更新")
-                # 控制旋转器
-                self.Rotator_AZ, self.Rotator_EL = self.calculate_az_el(new_balloon_lat, new_balloon_lng, new_balloon_alt)
-                # 更新数值
-                self.balloon_lat = new_balloon_lat
-                self.balloon_lng = new_balloon_lng
-                self.balloon_alt = new_balloon_alt
-                # 更新标签显示
-                self.GPS_status_icon.setPixmap(success)
-                self.GPS_label.setText(f"GPS 数据：就绪")
-                self.GPS_label.adjustSize()
-                self.GPS_LAT_NUM.setText(f"{self.balloon_lat:.6f}")
-                self.GPS_LAT_NUM.adjustSize()
-                self.GPS_LON_NUM.setText(f"{self.balloon_lng:.6f}")
-                self.GPS_LON_NUM.adjustSize()
-                self.GPS_ALT_NUM.setText(f"{self.balloon_alt:.2f} m")
-                self.GPS_ALT_NUM.adjustSize()
-                self.GPS_SPD_NUM.setText(f"{self.balloon_spd:.2f} m/s")
-                self.GPS_SPD_NUM.adjustSize()
-                self.GPS_SATS_NUM.setText(f"{self.balloon_sats}")
-                self.GPS_SATS_NUM.adjustSize()
-                self.GPS_heading_NUM.setText(f"{self.balloon_heading:.2f}")
-                self.GPS_heading_NUM.adjustSize()
-                self.rotator_az_NUM.setText(f"{self.Rotator_AZ:.2f}")
-                self.rotator_az_NUM.adjustSize()
-                self.rotator_el_NUM.setText(f"{self.Rotator_EL:.2f}")
-                self.rotator_el_NUM.adjustSize()
-
-                # 更新地图显示
-                self.update_map_position()
-            else:
-                self.GPS_status_icon.setPixmap(failure)
-                self.debug_info(f"[注意] GPS 数据无效")
-                # 更新标签
-                self.GPS_label.setText(f"GPS 数据：无效")
-                self.GPS_label.adjustSize()
+        # 按帧前缀查表分派，先以前 2 个字符查找，未命中再以前 5 个字符查找
+        handler = self.text_frame_handlers.get(text[:2]) or self.text_frame_handlers.get(text[:5])
+        if handler:
+            handler(text)
 
-            # 获取现在的时间并将其格式化
-            time_received = datetime.now(timezone.utc)
-            time_received = time_received.strftime('%Y-%m-%dT%H:%M:%S') + 'Z'
+        # 对于不符合任何已知格式的文本，直接显示
+        else:
+            self.debug_info(f"{text}")
 
-            # 调用 SondeHub API接口
-            try:
-                command_args = [
-                    "./sondehub",
-                    f"{self.callsign}",            # 上传者呼号
-                    f"{time_received}",            # 接收时间
-                    f"{balloon_callsign}",         # 气球呼号
-                    f"{self.balloon_time}",        # 球上时间
-                    f"{new_balloon_lng}",          # 气球经度
-                    f"{new_balloon_lat}",          # 气球纬度
-                    f"{new_balloon_alt}",          # 气球高度 
-                    f"{self.balloon_heading}",     # 气球航向
-                    f"{self.balloon_spd}",         # 气球速度 
-                    f"{self.balloon_sats}",        # 卫星数量
-                    f"{self.balloon_temprature}",  # 球上温度
-                    f"{self.balloon_voltage}",     # 球上电压
-                    f"{self.local_lng}",           # 地面站经度
-                    f"{self.local_lat}",           # 地面站纬度
-                    f"{self.local_alt}",           # 地面站高度
-                    "normal"                       # 开发状态
-                ]
-                subprocess.Popen(command_args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, creationflags=subprocess.CREATE_NO_WINDOW)
-            except Exception as e:
-                self.debug_info(f"SondeHub上传失败: {e}")
-                return False
-            
+    # 处理 $$ 开头的遥测数据
+    # $$CALLSIGN,Frame_Counter,HH:MM:SS,latitude,longitude,altitude,speed,sats,heading
+    def handle_telemetry_frame(self, text):
+        try:
+            fields = text[2:].strip().split(",")
+            if len(fields) == 12:
+                # 一次性解包全部字段，再批量转换数值字段
+                (balloon_callsign,      # 气球呼号
+                 telemetry_counter,     # 帧计数
+                 self.balloon_time,     # 球上时间
+                 lat_str,               # 气球纬度
+                 lng_str,               # 气球经度
+                 alt_str,               # 气球高度
+                 spd_str,               # 气球速度
+                 sats_str,              # 卫星数量
+                 heading_str,           # 气球航向
+                 temprature_str,        # 球上温度
+                 voltage_str,           # 球上电压
+                 self.gps_validity      # 定位状态
+                ) = fields
+                (new_balloon_lat, new_balloon_lng, new_balloon_alt, self.balloon_spd,
+                 self.balloon_heading, self.balloon_temprature, self.balloon_voltage
+                ) = map(float, (lat_str, lng_str, alt_str, spd_str, heading_str, temprature_str, voltage_str))
+                self.balloon_sats = int(sats_str)
+            else:
+                self.debug_info(f"[警告] 遥测数据格式错误: {text}")
+                return
+        except Exception as e:
+            self.debug_info(f"遥测数据解析出错：{e}")
             return
         
-        # 处理 ## 开头的中继数据帧
-        # ##RELAY,ToCall,FmCall,Grid,INFO
-        elif text.startswith("##"):
-            self.Frame_type_output.setText("中继数据帧")
-            self.Frame_type_output.adjustSize()
+        # 更新 UI 显示
+        self.Frame_type_output.setText(f"基本遥测帧 {telemetry_counter}")
+
+        # GPS 有效性检查
+        if self.gps_validity == "A":
+            self.debug_info(f"遥测数据已更新")
+            # 控制旋转器
+            self.Rotator_AZ, self.Rotator_EL = self.calculate_az_el(new_balloon_lat, new_balloon_lng, new_balloon_alt)
+            # 更新数值
+            self.balloon_lat = new_balloon_lat
+            self.balloon_lng = new_balloon_lng
+            self.balloon_alt = new_balloon_alt
+            # 更新标签显示
+            self.set_status_icon(self.GPS_status_icon, success)
+            self.update_label(self.GPS_label, "GPS 数据：就绪", adjust=True)
+            self.update_label(self.GPS_LAT_NUM, f"{self.balloon_lat:.6f}")
+            self.update_label(self.GPS_LON_NUM, f"{self.balloon_lng:.6f}")
+            self.update_label(self.GPS_ALT_NUM, f"{self.balloon_alt:.2f} m")
+            self.update_label(self.GPS_SPD_NUM, f"{self.balloon_spd:.2f} m/s")
+            self.update_label(self.GPS_SATS_NUM, f"{self.balloon_sats}")
+            self.update_label(self.GPS_heading_NUM, f"{self.balloon_heading:.2f}")
+            self.update_label(self.rotator_az_NUM, f"{self.Rotator_AZ:.2f}")
+            self.update_label(self.rotator_el_NUM, f"{self.Rotator_EL:.2f}")
+
+            # 更新地图显示
+            self.update_map_position()
+        else:
+            self.set_status_icon(self.GPS_status_icon, failure)
+            self.debug_info(f"[注意] GPS 数据无效")
+            # 更新标签
+            self.update_label(self.GPS_label, "GPS 数据：无效", adjust=True)
+
+        # 获取现在的 UTC 时间并将其格式化，直接格式化时间结构体，无需构造 datetime 对象
+        time_received = strftime('%Y-%m-%dT%H:%M:%SZ', gmtime())
+
+        # 调用 SondeHub API接口，交由上传线程在后台执行
+        command_args = [
+            "./sondehub",
+            f"{self.callsign}",            # 上传者呼号
+            f"{time_received}",            # 接收时间
+            f"{balloon_callsign}",         # 气球呼号
+            f"{self.balloon_time}",        # 球上时间
+            f"{new_balloon_lng}",          # 气球经度
+            f"{new_balloon_lat}",          # 气球纬度
+            f"{new_balloon_alt}",          # 气球高度 
+            f"{self.balloon_heading}",     # 气球航向
+            f"{self.balloon_spd}",         # 气球速度 
+            f"{self.balloon_sats}",        # 卫星数量
+            f"{self.balloon_temprature}",  # 球上温度
+            f"{self.balloon_voltage}",     # 球上电压
+            f"{self.local_lng}",           # 地面站经度
+            f"{self.local_lat}",           # 地面站纬度
+            f"{self.local_alt}",           # 地面站高度
+            "normal"                       # 开发状态
+        ]
+        if not self.sondehub_uploader.submit(self.balloon_time, command_args):
+            self.debug_info("SondeHub 上传队列已满，丢弃 1 帧")
 
-            try:
-                fields = text[2:].split(",", maxsplit=4)
-                if len(fields) >= 5:
-                    to_call = fields[1]
-                    fm_call = fields[2]
-                    grid    = fields[3]
-                    info    = fields[4]
-
-                    # 获取格式化的接收时间并通过信号槽输入QSO窗口
-                    time_str = datetime.now().strftime("%H:%M:%S")
-                    self.rx_message.emit(time_str, fm_call, to_call, grid, info, "Balloon")
-                    return
-                else:
-                    self.debug_info("中继数据字段不足，解析失败")
-            except Exception as e:
-                self.debug_info(f"中继数据解析出错：{e}")
-            return
+    # 处理 ## 开头的中继数据帧
+    # ##RELAY,ToCall,FmCall,Grid,INFO
+    def handle_relay_frame(self, text):
+        self.Frame_type_output.setText("中继数据帧")
 
-        # 处理系统状态码 (Code: 0xXXXX)
-        elif text.startswith("Code:"):
-            self.Frame_type_output.setText(f"状态提示帧")
-            self.Frame_type_output.adjustSize()
-            
-            # 使用正则表达式解析状态码和可选的Payload
-            match = re.search(r"Code: 0x([0-9A-Fa-f]{4})(?:, Info: (.*))?", text)
-            if not match:
+        try:
+            fields = text[2:].split(",", maxsplit=4)
+            if len(fields) >= 5:
+                to_call = fields[1]
+                fm_call = fields[2]
+                grid    = fields[3]
+                info    = fields[4]
+
+                # 获取格式化的接收时间并通过信号槽输入QSO窗口
+                time_str = strftime("%H:%M:%S")
+                self.rx_message.emit(time_str, fm_call, to_call, grid, info, "Balloon")
                 return
-
-            # 提取状态码和 Payload
-            status_code_hex = match.group(1)
-            payload_hex = match.group(2)
-            status_code = int(status_code_hex, 16)
-
-            # 从字典中查找对应的处理信息
-            if status_code in self.status_code_map:
-                prompt, icon_category, icon = self.status_code_map[status_code]
-                
-                # 调用翻译函数，构造并显示调试信息
-                debug_message = f"{prompt}"
-                if payload_hex:
-                    translated_payload = self.translate_payload(status_code, payload_hex)
-                    debug_message += f": {translated_payload}"
-                
-                self.debug_info(debug_message)
-
-                # 更新对应的状态图标
-                if icon_category and icon:
-                    if icon_category == "init":
-                        self.init_status_icon.setPixmap(icon)
-                    elif icon_category == "camera":
-                        self.Camera_status_icon.setPixmap(icon)
-                    elif icon_category == "gps":
-                        self.GPS_status_icon.setPixmap(icon)
-                    elif icon_category == "data":
-                        self.Data_status_icon.setPixmap(icon)
             else:
-                self.debug_info(f"收到未知状态码: 0x{status_code_hex.upper()}")
-            return
+                self.debug_info("中继数据字段不足，解析失败")
+        except Exception as e:
+            self.debug_info(f"中继数据解析出错：{e}")
+
+    # 处理系统状态码 (Code: 0xXXXX)
+    def handle_status_frame(self, text):
+        self.Frame_type_output.setText(f"状态提示帧")
         
-        # 对于不符合任何已知格式的文本，直接显示
+        # 使用预编译的正则表达式解析状态码和可选的Payload
+        match = status_frame_pattern.search(text)
+        if not match:
+            return
+
+        # 提取状态码和 Payload
+        status_code_hex = match.group(1)
+        payload_hex = match.group(2)
+        status_code = int(status_code_hex, 16)
+
+        # 从字典中查找对应的处理信息，仅查找一次
+        status_entry = self.status_code_map.get(status_code)
+        if status_entry is not None:
+            prompt, icon_category, icon = status_entry
+            
+            # 调用翻译函数，构造并显示调试信息
+            debug_message = f"{prompt}"
+            if payload_hex:
+                translated_payload = self.translate_payload(status_code, payload_hex)
+                debug_message += f": {translated_payload}"
+            
+            self.debug_info(debug_message)
+
+            # 更新对应的状态图标
+            status_icon = self.status_icons.get(icon_category)
+            if status_icon and icon:
+                self.set_status_icon(status_icon, icon)
         else:
-            self.debug_info(f"{text}")
+            self.debug_info(f"收到未知状态码: 0x{status_code_hex.upper()}")
 
 
     # 提取 SSDV 数据
     def try_extract_ssdv(self) -> bool:
         
-        # 定义帧信息并寻找帧头
-        header1 = b"\x55\x67" # NOFEC模式
-        header2 = b"\x55\x66" # 正常模式
-        frame_len = 256
-        start = self.rx_buffer.find(header1)
-        if start == -1: start = self.rx_buffer.find(header2)
+        # 寻找帧头，从上次扫描结束的位置继续查找，已扫描过的数据不再重复查找
+        frame_len = ssdv_frame_len
+        scan_pos = self.ssdv_scan_pos
+        start = self.rx_buffer.find(ssdv_nofec_header, scan_pos)
+        if start == -1: start = self.rx_buffer.find(ssdv_normal_header, scan_pos)
+
+        # 未找到帧头时记录扫描位置，保留末尾 1 字节以防帧头被拆分在两次接收的数据之间
+        if start == -1:
+            self.ssdv_scan_pos = max(0, len(self.rx_buffer) - 1)
+            return False
 
         # 首先判断是否为完整帧再进行提取
-        if start == -1 or len(self.rx_buffer) - start < frame_len: return False
-        frame = self.rx_buffer[start:start + frame_len]
-
-        # 接收到SSDV数据包证明数传正常，摄像头工作正常，初始化正常
-        self.Data_status_icon.setPixmap(success)
-        self.Camera_status_icon.setPixmap(success)
-        self.init_status_icon.setPixmap(success)
-
-        # 提取图像编号并检查是否变化
-        try:
-            current_img_num = frame[6]
-            if current_img_num != self.img_num or self.img_num == -1:
-                self.img_num = current_img_num
-                time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-                self.filename = f"{time}"
-                self.frame_num = 1
-        except:
-            print("图像编号提取失败")
-            self.rx_buffer = self.rx_buffer[start + frame_len:]
+        if len(self.rx_buffer) - start < frame_len:
+            self.ssdv_scan_pos = start
             return False
+        # 接收到SSDV数据包证明数传正常，摄像头工作正常，初始化正常
+        self.set_status_icon(self.Data_status_icon, success)
+        self.set_status_icon(self.Camera_status_icon, success)
+        self.set_status_icon(self.init_status_icon, success)
+
+        # 提取图像编号并检查是否变化，帧长度已在上方确认，直接索引不会越界
+        current_img_num = self.rx_buffer[start + 6]
+        if current_img_num != self.img_num or self.img_num == -1:
+            self.img_num = current_img_num
+            time = strftime("%Y-%m-%d_%H-%M-%S")
+            self.filename = f"{time}"
+            self.frame_num = 1
+            # 上一幅图像尚有未解码的帧时立即提交，确保其最终图像完整
+            if self.ssdv_decode_timer.isActive():
+                self.ssdv_decode_timer.stop()
+                self.submit_ssdv_decode()
+            self.open_dat_file()
+
+            # 图像文件名
+            self.SSDV_name_output.setText(f"{self.filename}")
+            self.SSDV_name_output.adjustSize()
         
         # 累计帧计数
         self.Frame_type_output.setText(f"SSDV 图像数据帧 {self.frame_num}")
-        self.Frame_type_output.adjustSize()
         self.frame_num += 1
 
-        # 图像文件名
-        self.SSDV_name_output.setText(f"{self.filename}")
-        self.SSDV_name_output.adjustSize()
-        
+        # 写入当前图像的 .dat 文件，数据先进入文件缓冲区，提交解码前统一写出
+        # 文件在串口断开时被关闭，重新连接后继续接收同一图像时以追加方式重新打开
+        if self.dat_file is None:
+            self.open_dat_file()
+        try:
+            if self.dat_file is None:
+                raise IOError("文件未打开")
+            # 通过 memoryview 直接写出缓冲区中的帧数据，无需复制，写入后立即释放以便随后删除已处理数据
+            with memoryview(self.rx_buffer) as buffer_view:
+                self.dat_file.write(buffer_view[start:start + frame_len])
+        except IOError as e:
+            self.debug_info(f"写入 SSDV 数据失败: {e}")
+            return False
+
+        # 由定时器合并后再将解码任务交给常驻的解码线程，避免每帧都重新解码整幅图像
+        if not self.ssdv_decode_timer.isActive():
+            self.ssdv_decode_timer.start()
+
+        # 从缓冲区移除已处理数据，原地删除头部只移动起始偏移，无需复制剩余数据
+        self.remove_rx_data(0, start + frame_len)
+        return True
+    
+    # 新图像开始时创建存储目录并打开其 .dat 文件，同时关闭上一幅图像的文件
+    def open_dat_file(self):
+        self.close_dat_file()
+
         # 定义并创建 SSDV 根目录
         user_home = os.path.expanduser('~')
         user_desktop_path = os.path.join(user_home, 'Desktop')
         ssdv_base_dir = os.path.join(user_desktop_path, 'SSDV')
-        os.makedirs(ssdv_base_dir, exist_ok=True)
 
         # 定义并创建 .dat 文件的存储目录
         dat_output_dir = os.path.join(ssdv_base_dir, 'dat')
         os.makedirs(dat_output_dir, exist_ok=True)
 
         # 构造完整路径
-        dat_filepath = os.path.join(dat_output_dir, f"{self.filename}.dat")
-        output_jpg_path = os.path.join(ssdv_base_dir, f"{self.filename}.jpg")
-        
+        self.dat_filepath = os.path.join(dat_output_dir, f"{self.filename}.dat")
+        self.jpg_filepath = os.path.join(ssdv_base_dir, f"{self.filename}.jpg")
+
         try:
-            with open(dat_filepath, "ab") as f:
-                f.write(frame)
+            self.dat_file = open(self.dat_filepath, "ab", buffering=64 * 1024)
         except IOError as e:
-            self.debug_info(f"写入 SSDV 数据失败: {e}")
-            return False
+            self.debug_info(f"创建 SSDV 数据文件失败: {e}")
 
-        # 启动一个工作线程来解码 SSDV，避免阻塞 UI
-        self.decoder_thread = SsdvDecoderThread(dat_filepath, output_jpg_path, self)
-        
-        # 连接解码完成信号到处理结果的槽
-        self.decoder_thread.decoding_finished.connect(self.on_decoding_finished)
-        
-        # 连接日志信号到显示调试信息的槽
-        self.decoder_thread.log_message.connect(self.debug_info)
-        
-        # 确保线程结束后能被Qt安全地回收内存
-        self.decoder_thread.finished.connect(self.decoder_thread.deleteLater) 
-        self.decoder_thread.start()
+    # 关闭当前图像的 .dat 文件
+    def close_dat_file(self):
+        if self.dat_file is not None:
+            self.dat_file.close()
+            self.dat_file = None
 
-        # 从缓冲区移除已处理数据
-        self.rx_buffer = self.rx_buffer[start + frame_len:]
-        return True
-    
     # 管理收发信机串口连接
     def Connect_Radio_COM(self):
         port_name = self.Radio_COM_Combo.currentData()
@@ -864,6 +1037,7 @@ class GUI(QWidget):
             self.Radio_Serial_Thread.data_received.connect(self.Handle_Radio_Serial_Data)
             self.Radio_Serial_Thread.disconnected.connect(self.Radio_Disconnected)
             self.Radio_Serial_Thread.connection_failed.connect(self.on_connection_failed)
+            self.Radio_Serial_Thread.queue_overflowed.connect(lambda dropped: self.debug_info(f"发送队列已满，已丢弃 {dropped} 条最早的数据。"))
             self.Radio_Serial_Thread.start()
 
             # 检查是否已经成功连接
@@ -901,20 +1075,22 @@ class GUI(QWidget):
         if self.Radio_Serial_Thread:
             self.Radio_Serial_Thread.stop()
             self.Radio_Serial_Thread = None
+        self.close_dat_file()
 
     # 发送数据到收发信机串口
-    def Send_Data_to_Radio(self, data_to_send: str):
+    # 各发送窗口已将数据编码为字节串，此处直接交给串口线程
+    def Send_Data_to_Radio(self, data_to_send: bytes):
         # 检查收发信机串口是否打开
         if self.Radio_Serial_Thread and self.Radio_Serial_Thread.isRunning():
             try:
-                self.Radio_Serial_Thread.send_data(data_to_send.encode('utf-8'))
+                self.Radio_Serial_Thread.send_data(data_to_send)
             except Exception as e:
-                print(f"数据编码发送时发生错误: {e}")
+                print(f"数据发送时发生错误: {e}")
 
             # 记录发送的数据到日志文件
-            time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            with open("log.txt", "a", encoding="utf-8") as f:
-                f.write(f"{time}    » {data_to_send}")
+            if not self.log_file.closed:
+                time = strftime("%Y-%m-%d %H:%M:%S")
+                self.log_file.write(f"{time}    » {data_to_send.decode('utf-8', 'replace')}")
         else:
             self.debug_info("接收机串口未连接或未运行，无法发送数据。")
             QMessageBox.warning(self, "发送失败", "接收机串口未连接或未运行。")
@@ -924,20 +1100,8 @@ class GUI(QWidget):
         QMessageBox.warning(self, "警告", "天线旋转器功能尚未实现")
         self.debug_info("旋转器功能尚未实现")
 
-    # 刷新系统中所有可用串口信息，并更新到下拉框中
-    def Update_COM_Info(self):
-        ports = list_ports.comports()
-        current_ports = [(p.device, p.description) for p in ports]
-
-        # 初始化缓存 (首次调用) 
-        if not hasattr(self, 'port_list_cache'):
-            self.port_list_cache = []
-            self.Radio_COM_Combo.addItem("尚未选择", userData=None)
-            self.Rotator_COM_Combo.addItem("尚未选择", userData=None)
-
-        # 检查是否有变化，如果没有变化则跳过刷新
-        if current_ports == self.port_list_cache: return
-        self.port_list_cache = current_ports
+    # 刷新系统中所有可用串口信息，并更新到下拉框中（由串口枚举线程在列表变化时触发）
+    def Update_COM_Info(self, current_ports):
 
         # 记录之前已选中的串口
         Radio_Selected = self.Radio_COM_Combo.currentData()
@@ -1074,11 +1238,44 @@ class GUI(QWidget):
         azimuth, elevation = enu_to_az_el(enu)
         return azimuth, elevation
 
-    # 更新气球在地图中的位置
+    # 更新气球在地图中的位置，由定时器合并推送
     def update_map_position(self):
+        if not self.map_update_timer.isActive():
+            self.map_update_timer.start()
+
+    # 将最新位置推送到地图页面，坐标（保留 5 位小数）未变化时跳过
+    def push_map_position(self):
+        coords = (
+            round(self.balloon_lat, 5), round(self.balloon_lng, 5),
+            round(self.local_lat, 5), round(self.local_lng, 5),
+        )
+        if coords == self.last_map_coords:
+            return
+
+        # 首次定位时创建地图，页面加载完成后由 on_map_loaded 推送位置
+        if self.map_view is None:
+            self.create_map_view()
+            return
+
+        self.last_map_coords = coords
         js_code = f"updatePosition({self.balloon_lat}, {self.balloon_lng}, {self.local_lat}, {self.local_lng});"
         self.map_view.page().runJavaScript(js_code)
 
+    # 创建地图网页视图并替换占位标签
+    def create_map_view(self):
+        self.map_view = QWebEngineView(self)
+        self.map_view.setGeometry(40, 130, 320, 240)
+        self.map_view.loadFinished.connect(self.on_map_loaded)
+        self.map_view.setUrl(QUrl("http://hab.satellites.ac.cn/map"))
+        self.map_placeholder.hide()
+        self.map_view.show()
+
+    # 地图页面（重新）加载完成后推送当前位置
+    def on_map_loaded(self, ok):
+        if ok:
+            self.last_map_coords = None
+            self.push_map_position()
+
     # 枚举值翻译函数
     def translate_payload(self, status_code, payload):
         
@@ -1114,12 +1311,15 @@ class GUI(QWidget):
     def on_decoding_finished(self, jpg_filepath):
 
         # 检查解码是否成功
-        if jpg_filepath and os.path.exists(jpg_filepath):
-            pixmap = QPixmap(jpg_filepath)
-            # 检查文件是否可被 QPixmap 加载
-            if not pixmap.isNull():
-                self.SSDV_IMG.setPixmap(pixmap.scaled(320, 240, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
-                self.SSDV_IMG.repaint()
+        # 解码线程仅在 ssdv 成功返回时给出路径，文件无法读取时由 reader 返回空图像，无需额外检查文件是否存在
+        if jpg_filepath:
+            # 按显示尺寸直接解码，JPEG 解码器可在解码阶段完成缩放，无需先解码原尺寸图像再缩小
+            reader = QImageReader(jpg_filepath)
+            reader.setScaledSize(reader.size().scaled(QSize(320, 240), Qt.AspectRatioMode.KeepAspectRatio))
+            image = reader.read()
+            # 检查文件是否可被加载
+            if not image.isNull():
+                self.SSDV_IMG.setPixmap(QPixmap.fromImage(image))
             else:
                 print(f"解码文件 {os.path.basename(jpg_filepath)} 已生成但无法加载。")
         else:
@@ -1133,22 +1333,19 @@ class GUI(QWidget):
         self.local_lat = new_lat
         self.local_lng = new_lng
         self.local_alt = new_alt
+        self.grid = latlng_to_maiden(new_lat, new_lng)
 
         # 更新配置文件中的信息
-        if not config.has_section("GroundStation"):
-            config.add_section("GroundStation")
-
-        config.set("GroundStation", "Callsign", new_callsign)
-        config.set("GroundStation", "Latitude", str(new_lat))
-        config.set("GroundStation", "Longitude", str(new_lng))
-        config.set("GroundStation", "Altitude", str(new_alt))
-
-        with open("config.ini", "w") as configfile:
-            config.write(configfile)
+        update_station_config({
+            "Callsign": new_callsign,
+            "Latitude": str(new_lat),
+            "Longitude": str(new_lng),
+            "Altitude": str(new_alt),
+        })
 
         # 如果 QSO 窗口已打开，更新它的信息
         if self.QSO_window:
-            self.QSO_window.update_station_info(self.callsign, self.local_lat, self.local_lng)
+            self.QSO_window.update_station_info(self.callsign, self.local_lat, self.local_lng, self.grid)
 
         # 进行提示
         self.debug_info("地面站信息已更新")
@@ -1170,7 +1367,7 @@ class GUI(QWidget):
     def QSO(self):
         if self.Radio_Serial_Thread and self.Radio_Serial_Thread.serial and self.Radio_Serial_Thread.serial.is_open:
             if self.QSO_window is None:
-                self.QSO_window = QSO_Windows(self.callsign, self.local_lat, self.local_lng)
+                self.QSO_window = QSO_Windows(self.callsign, self.local_lat, self.local_lng, self.grid)
                 self.QSO_window.tx_message.connect(self.Send_Data_to_Radio)
                 self.rx_message.connect(self.QSO_window.add_info_table_row)
             self.QSO_window.show()
@@ -1192,6 +1389,19 @@ class GUI(QWidget):
 
         warn = QMessageBox.question(self, "提示", "是否确定要退出程序？", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if warn == QMessageBox.StandardButton.Yes:
+            # 先断开并停止串口线程，避免关闭日志文件后仍有接收数据到达
+            if self.Radio_Serial_Thread:
+                self.Radio_Serial_Thread.data_received.disconnect()
+                self.Radio_Serial_Thread.disconnected.disconnect()
+                self.Radio_Serial_Thread.stop()
+                self.Radio_Serial_Thread = None
+            self.port_scanner.stop()
+            self.ssdv_decode_timer.stop()
+            self.ssdv_decoder.stop()
+            self.sondehub_uploader.stop()
+            self.log_flush_timer.stop()
+            self.log_file.close()
+            self.close_dat_file()
             QApplication.closeAllWindows()
             event.accept()
         else:
@@ -1292,12 +1502,46 @@ class SET_Windows(QDialog):
         self.reject()
         event.accept()
 
+# 通联记录表格的数据模型，每行为 (时间, 呼号, 网格)，无需为每个单元格创建表格项
+class QSOTableModel(QAbstractTableModel):
+
+    headers = ("   时间   ", "  呼号  ", "  网格  ")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._rows[index.row()][index.column()]
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return None
+
+    # 在末尾一次性追加多行
+    def append_rows(self, rows):
+        position = len(self._rows)
+        self.beginInsertRows(QModelIndex(), position, position + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
 # 信息发送窗口
 class QSO_Windows(QWidget):
-    # 定义一个信号，用于发射时向主窗口传输拼装好的信息
-    tx_message = pyqtSignal(str)
+    # 定义一个信号，用于发射时向主窗口传输拼装好的信息（已编码的字节串）
+    tx_message = pyqtSignal(bytes)
 
-    def __init__(self, callsign, current_lat, current_lng):
+    def __init__(self, callsign, current_lat, current_lng, grid):
         super().__init__()
 
         # 窗口属性
@@ -1312,14 +1556,17 @@ class QSO_Windows(QWidget):
         self.callsign = callsign
         self.current_lat = current_lat
         self.current_lng = current_lng
-        self.grid = self.latlng_to_maiden(self.current_lat, self.current_lng)
+        self.grid = grid
+
+        # 发送信息中固定不变的 “,FmCall,Grid,” 部分，预先编码，仅在呼号或坐标变化时更新
+        self.tx_station_part = f",{self.callsign},{self.grid},".encode('utf-8')
 
         # 构建信息用的参数
         self.ToCallSign = "CQ"
         self.ToMSG = "测试"
 
         # 拼装后的信息
-        self.TofullMSG = ""
+        self.TofullMSG = b""
 
         # 初始化统计信息
         self.rx_count = 0
@@ -1330,6 +1577,13 @@ class QSO_Windows(QWidget):
         # 防止在程序自动滚动时触发 handle_scroll 逻辑
         self.is_auto_scrolling = False 
 
+        # 待插入信息表格的行，短时间内到达的多条信息合并为一次批量插入
+        self.pending_info_rows = deque()
+        self.info_flush_scheduled = False
+
+        # 待插入通联表格的行，随信息表格的批量插入一并写入
+        self.pending_qso_rows = []
+
         # 初始化UI
         self.init_ui()
 
@@ -1410,6 +1664,10 @@ class QSO_Windows(QWidget):
         self.QSO_count_num.move(420, 90)
         self.QSO_count_num.setStyleSheet(primary_text_style)
 
+        # 计数标签使用固定宽度，延伸至计数区右边界，更新计数时无需重新计算尺寸
+        for label in (self.rx_count_num, self.tx_count_num, self.QSO_count_num):
+            label.setFixedWidth(490 - label.x())
+
         # 台站信息区
         self.station_info_frame = QWidget(self)
         self.station_info_frame.setGeometry(510, 25, 250, 100)
@@ -1496,11 +1754,11 @@ class QSO_Windows(QWidget):
 
         QSO_info_layout = QVBoxLayout(self.info_QSO_frame)
         QSO_info_layout.setContentsMargins(5, 5, 5, 5)
-        self.QSO_info_table = QTableWidget(self.info_QSO_frame)
+        self.QSO_info_table = QTableView(self.info_QSO_frame)
 
-        # 设置列数和列头标签
-        self.QSO_info_table.setColumnCount(3)
-        self.QSO_info_table.setHorizontalHeaderLabels(["   时间   ", "  呼号  ", "  网格  "])
+        # 绑定数据模型，列头标签由模型提供
+        self.qso_model = QSOTableModel(self.QSO_info_table)
+        self.QSO_info_table.setModel(self.qso_model)
         self.QSO_info_table.horizontalHeader().setStyleSheet(primary_text_style)
 
         # 设置列宽自适应填充可用空间
@@ -1508,18 +1766,19 @@ class QSO_Windows(QWidget):
 
         # 隐藏行号，设置表格的网格线颜色
         self.QSO_info_table.verticalHeader().setVisible(False)
-        self.QSO_info_table.setStyleSheet("QTableWidget { gridline-color: #DDDDDD; }")
+        self.QSO_info_table.setStyleSheet("QTableView { gridline-color: #DDDDDD; }")
 
         # 禁用编辑和选中
         self.QSO_info_table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
-        self.QSO_info_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.QSO_info_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         QSO_info_layout.addWidget(self.QSO_info_table)
 
-    def update_station_info(self, callsign, lat, lng):
+    def update_station_info(self, callsign, lat, lng, grid):
         self.callsign = callsign
         self.current_lat = lat
         self.current_lng = lng
-        self.grid = self.latlng_to_maiden(self.current_lat, self.current_lng)
+        self.grid = grid
+        self.tx_station_part = f",{self.callsign},{self.grid},".encode('utf-8')
         
         # 更新UI上的显示
         self.My_Callsign_label.setText(self.callsign)
@@ -1547,14 +1806,13 @@ class QSO_Windows(QWidget):
         # 计数
         self.tx_count += 1
         self.tx_count_num.setText(str(self.tx_count))
-        self.tx_count_num.adjustSize()
 
         # 当前时间
-        current_time = datetime.now().strftime("%H:%M:%S")
+        current_time = strftime("%H:%M:%S")
 
         # 构建消息字符串：##ToCall,FmCall,Grid,INFO\n
         # 调试版本 full_msg = f"** ##RELAY,{to_call},{self.callsign},{self.grid},{msg} **"
-        full_msg = f"##{to_call},{self.callsign},{self.grid},{msg}\n"
+        full_msg = b"".join((b"##", to_call.encode('utf-8'), self.tx_station_part, msg.encode('utf-8'), b"\n"))
 
         # 保存完整消息
         self.TofullMSG = full_msg
@@ -1573,70 +1831,66 @@ class QSO_Windows(QWidget):
 
     # 添加数据到通联信息表格(此函数同时从串口线程读取数据)
     def add_info_table_row(self, time_str, source_call, target_call, grid, message, program):
+        self.pending_info_rows.append((time_str, source_call, target_call, grid, message, program))
+        if not self.info_flush_scheduled:
+            self.info_flush_scheduled = True
+            QTimer.singleShot(100, self.flush_info_table_rows)
+
+    # 将暂存的信息批量插入表格，插入期间暂停表格重绘
+    def flush_info_table_rows(self):
+        self.info_flush_scheduled = False
+        if not self.pending_info_rows:
+            return
 
         scrollbar = self.info_table.verticalScrollBar()
         is_at_bottom = scrollbar.value() >= scrollbar.maximum() - 5
 
-        # 计数器
-        self.rx_count += 1
-
-        # 直接使用 self.info_table 访问表格实例
-        row_position = self.info_table.rowCount()
-        self.info_table.insertRow(row_position)
-
-        # 时间
-        item_time = QTableWidgetItem(time_str)
-        item_time.setTextAlignment(Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter)
-        self.info_table.setItem(row_position, 0, item_time)
-
-        # 源站呼号
-        item_source_call = QTableWidgetItem(source_call)
-        item_source_call.setTextAlignment(Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter)
-        self.info_table.setItem(row_position, 1, item_source_call)
-
-        # 目标呼号
-        item_target_call = QTableWidgetItem(target_call)
-        item_target_call.setTextAlignment(Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter)
-        self.info_table.setItem(row_position, 2, item_target_call)
-
-        # 信息
-        item_message = QTableWidgetItem(f"{grid}, {message}")
-        item_message.setTextAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-        self.info_table.setItem(row_position, 3, item_message)
-
-        # 将自己发送的消息颜色设置为#FFA07A
-        if source_call == self.callsign and program == "Ground":
-            self.rx_count -= 1
-            for col in range(self.info_table.columnCount()):
-                item = self.info_table.item(row_position, col)
-                if item:
-                    item.setBackground(QColor("#FFA07A"))
-        # 从气球上转发回来的自己的消息
-        elif source_call == self.callsign and program == "Balloon":
-            for col in range(self.info_table.columnCount()):
-                item = self.info_table.item(row_position, col)
-                if item:
-                    item.setBackground(QColor("#FFE4EA"))
-        # 将发给我的消息设置为#00BFFF
-        elif target_call == self.callsign:
-            for col in range(self.info_table.columnCount()):
-                item = self.info_table.item(row_position, col)
-                if item:
-                    item.setBackground(QColor("#00BFFF"))
+        # 一次性扩展表格行数，避免逐行插入
+        table = self.info_table
+        table.setUpdatesEnabled(False)
+        row_position = table.rowCount()
+        table.setRowCount(row_position + len(self.pending_info_rows))
+
+        while self.pending_info_rows:
+            time_str, source_call, target_call, grid, message, program = self.pending_info_rows.popleft()
+
+            # 计数器
+            self.rx_count += 1
+
+            # 根据消息来源与去向确定整行背景色
+            # 将自己发送的消息颜色设置为#FFA07A
+            if source_call == self.callsign and program == "Ground":
+                self.rx_count -= 1
+                background = own_message_color
+            # 从气球上转发回来的自己的消息
+            elif source_call == self.callsign and program == "Balloon":
+                background = own_relayed_color
+            # 将发给我的消息设置为#00BFFF
+            elif target_call == self.callsign:
+                background = to_me_message_color
                 if "73" in message:
                     self.add_qso_table_row(source_call, grid)
-        #将他人的CQ设置为#EE82EE
-        elif target_call == "CQ":
-            for col in range(self.info_table.columnCount()):
-                item = self.info_table.item(row_position, col)
-                if item:
-                    item.setBackground(QColor("#EE82EE"))
-        # 其他普通消息设置为#FFFFFF
-        else:
-            for col in range(self.info_table.columnCount()):
-                item = self.info_table.item(row_position, col)
-                if item:
-                    item.setBackground(QColor("#FFFFFF"))
+            #将他人的CQ设置为#EE82EE
+            elif target_call == "CQ":
+                background = cq_message_color
+            # 其他普通消息设置为#FFFFFF
+            else:
+                background = normal_message_color
+
+            # 时间、源站呼号、目标呼号居中显示，信息左对齐
+            items = (
+                (QTableWidgetItem(time_str), Qt.AlignmentFlag.AlignCenter),
+                (QTableWidgetItem(source_call), Qt.AlignmentFlag.AlignCenter),
+                (QTableWidgetItem(target_call), Qt.AlignmentFlag.AlignCenter),
+                (QTableWidgetItem(f"{grid}, {message}"), Qt.AlignmentFlag.AlignLeft),
+            )
+            for col, (item, alignment) in enumerate(items):
+                item.setTextAlignment(alignment | Qt.AlignmentFlag.AlignVCenter)
+                item.setBackground(background)
+                table.setItem(row_position, col, item)
+            row_position += 1
+
+        table.setUpdatesEnabled(True)
 
         # 根据位置决定是自动滚动还是显示按钮
         if is_at_bottom:
@@ -1648,45 +1902,38 @@ class QSO_Windows(QWidget):
 
         # 更新计数
         self.rx_count_num.setText(str(self.rx_count))
-        self.rx_count_num.adjustSize()
 
-    # 添加 QSO 表格行
+        # 本批信息中新增的通联记录一次性写入
+        if self.pending_qso_rows:
+            self.flush_qso_table_rows()
+
+    # 添加 QSO 表格行，暂存后由 flush_qso_table_rows 批量插入
     def add_qso_table_row(self, source_call, grid):
 
-        # 如果已经记录过该呼号则跳过
-        if source_call in self.qso_callsigns:
+        # 添加到已记录集合，集合大小未变说明已经记录过该呼号，直接跳过
+        qso_callsigns = self.qso_callsigns
+        known_count = len(qso_callsigns)
+        qso_callsigns.add(source_call)
+        if len(qso_callsigns) == known_count:
             return
 
-        # 添加到已记录集合
-        self.qso_callsigns.add(source_call)
-
-        # 计数
-        self.QSO_count += 1
-        self.QSO_count_num.setText(str(self.QSO_count))
-        self.QSO_count_num.adjustSize()
-
-        # 插入表格行
-        row_position = self.QSO_info_table.rowCount()
-        self.QSO_info_table.insertRow(row_position)
+        # 暂存表格行：时间、对方呼号、网格
+        self.pending_qso_rows.append((strftime("%H:%M:%S"), source_call, grid))
 
-        # 时间
-        item_time = QTableWidgetItem(datetime.now().strftime("%H:%M:%S")) 
-        item_time.setTextAlignment(Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter)
-        self.QSO_info_table.setItem(row_position, 0, item_time)
+    # 将暂存的通联记录一次性插入表格，并只更新一次计数与滚动位置
+    def flush_qso_table_rows(self):
+        # 滚动条位置需在插入前判断
+        scrollbar = self.QSO_info_table.verticalScrollBar()
+        at_bottom = scrollbar.value() == scrollbar.maximum()
 
-        # 对方呼号
-        item_source_call = QTableWidgetItem(source_call)
-        item_source_call.setTextAlignment(Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter)
-        self.QSO_info_table.setItem(row_position, 1, item_source_call)
+        self.qso_model.append_rows(self.pending_qso_rows)
+        self.QSO_count += len(self.pending_qso_rows)
+        self.pending_qso_rows = []
 
-        # 网格
-        item_grid = QTableWidgetItem(grid)
-        item_grid.setTextAlignment(Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter)
-        self.QSO_info_table.setItem(row_position, 2, item_grid)
+        # 计数
+        self.QSO_count_num.setText(str(self.QSO_count))
 
         # 滚动到底部
-        scrollbar = self.QSO_info_table.verticalScrollBar()
-        at_bottom = scrollbar.value() == scrollbar.maximum()
         if at_bottom:
             self.QSO_info_table.scrollToBottom()
 
@@ -1727,21 +1974,11 @@ class QSO_Windows(QWidget):
         self.info_table.scrollToBottom()
         self.scrollToBottomButton.hide()
 
-    # 经纬度转梅登黑德网格
-    def latlng_to_maiden(self, lat, lon):
-        lat += 90
-        lon += 180
-        return (
-            f"{chr(int(lon // 20) + 65)}{chr(int(lat // 10) + 65)}"
-            f"{int((lon % 20) // 2)}{int(lat % 10)}"
-            f"{chr(int((lon % 2) * 12) + 97)}{chr(int((lat % 1) * 24) + 97)}"
-        )
-
 # 命令窗口
 class Command_Windows(QWidget):
 
     # 定义一个信号，用于发送消息
-    tx_message = pyqtSignal(str)
+    tx_message = pyqtSignal(bytes)
     
 
     # 定义窗口基本信息
@@ -1956,7 +2193,7 @@ class Command_Windows(QWidget):
             full_command = f"@@{command},{value},{self.password}\n"
         else:
             full_command = f"@@{command},{self.password}\n"
-        self.tx_message.emit(full_command)
+        self.tx_message.emit(full_command.encode('utf-8'))
 
     # 发送自由命令
     def send_freeform_command(self):
@@ -1965,7 +2202,7 @@ class Command_Windows(QWidget):
             QMessageBox.warning(self, "警告", "发送的命令不能为空。")
             return
 
-        self.tx_message.emit(command_text + '\n')
+        self.tx_message.emit((command_text + '\n').encode('utf-8'))
 
     # 选择密码文件并更新配置文件
     def select_password_file(self):
@@ -1977,11 +2214,7 @@ class Command_Windows(QWidget):
             self.load_password_from_file() # 重新加载密码
 
             # 保存到配置文件
-            if not config.has_section("GroundStation"):
-                config.add_section("GroundStation")
-            config.set("GroundStation", "CommandPasswordFile", file_path)
-            with open("config.ini", "w") as configfile:
-                config.write(configfile)
+            update_station_config({"CommandPasswordFile": file_path})
             
             self.main_window.debug_info(f"命令密码已选择")
 
@@ -1992,20 +2225,22 @@ class SerialConnection(QThread):
     data_received = pyqtSignal(bytes)
     disconnected = pyqtSignal()
     connection_failed = pyqtSignal(str)
+    queue_overflowed = pyqtSignal(int)
 
-    def __init__(self, port_name, baudrate=9600):
+    def __init__(self, port_name, baudrate=9600, max_queue=16):
         super().__init__()
         self.port_name = port_name
         self.baudrate = baudrate
         self._running = True
         self.serial = None
-        self._send_queue = []
+        # 有界发送队列，串口发送跟不上时自动丢弃最旧的数据
+        self._send_queue = deque(maxlen=max_queue)
 
     # 打开串口并读取数据
     def run(self):
         # 尝试打开串口
         try:
-            self.serial = serial.Serial(self.port_name, self.baudrate, timeout=1)
+            self.serial = serial.Serial(self.port_name, self.baudrate, timeout=0.1)
             self.serial.dtr = False
             self.serial.rts = False
         except serial.SerialException as e:
@@ -2017,16 +2252,19 @@ class SerialConnection(QThread):
 
         while self._running:
             try:
-                # 读取数据
-                if self.serial.in_waiting:
-                    data = self.serial.read(self.serial.in_waiting)
+                # 阻塞等待数据到达，线程在系统调用中休眠而非空转，有待发送数据时由 send_data 提前唤醒
+                data = self.serial.read(1)
+                if data:
+                    waiting = self.serial.in_waiting
+                    if waiting:
+                        data += self.serial.read(waiting)
                     self.data_received.emit(data)
 
-                # 发送数据
-                if self._send_queue:
-                    data_to_send = self._send_queue.pop(0)
-                    self.serial.write(data_to_send)
-                    QThread.msleep(25)
+                # 发送全部待发送数据，仅在连续发送之间保留间隔，避免无线模块缓冲区溢出
+                while self._send_queue:
+                    self.serial.write(self._send_queue.popleft())
+                    if self._send_queue:
+                        QThread.msleep(25)
 
             except serial.SerialException as e:
                 print(f"[错误] 串口异常断开：{e}")
@@ -2042,17 +2280,53 @@ class SerialConnection(QThread):
 
     # 发送数据
     def send_data(self, data: bytes):
+        # 队列已满时，追加操作会丢弃最旧的一条数据，发射信号告知丢弃数量
+        if len(self._send_queue) == self._send_queue.maxlen:
+            self.queue_overflowed.emit(1)
         self._send_queue.append(data)
+        # 取消正在进行的阻塞读取，使线程立即发送数据
+        port = self.serial
+        if port and port.is_open:
+            port.cancel_read()
 
     # 停止线程
     def stop(self):
         self._running = False
         if self.serial and self.serial.is_open:
+            self.serial.cancel_read()
             self.serial.close()
         self.quit()
         self.wait()
 
+# 串口枚举线程，定时枚举系统串口，避免枚举系统设备时阻塞主线程
+class SerialPortScanThread(QThread):
+
+    # 定义信号，串口列表变化时发射，参数为 (设备名, 描述) 元组
+    ports_changed = pyqtSignal(tuple)
+
+    def __init__(self, parent=None, interval=1.0):
+        super().__init__(parent)
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        last_ports = None
+        while not self._stop_event.is_set():
+            current_ports = tuple((p.device, p.description) for p in list_ports.comports())
+
+            # 检查是否有变化，如果没有变化则不通知主线程
+            if current_ports != last_ports:
+                last_ports = current_ports
+                self.ports_changed.emit(current_ports)
+            self._stop_event.wait(self.interval)
+
+    # 停止线程
+    def stop(self):
+        self._stop_event.set()
+        self.wait()
+
 # SSDV 解码工作线程，避免阻塞主线程。
+# 线程常驻运行，由队列接收解码任务，同一图像在排队期间只保留一个任务
 class SsdvDecoderThread(QThread):
 
     # 定义信号，解码完成后发射，参数为解码后的 jpg 文件路径
@@ -2061,23 +2335,40 @@ class SsdvDecoderThread(QThread):
     # 定义信号，解码过程中发射，参数为日志信息
     log_message = pyqtSignal(str)
 
-    def __init__(self, dat_filepath, jpg_filepath, parent=None):
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.dat_filepath = dat_filepath
-        self.jpg_filepath = jpg_filepath
+        self._queue = queue.Queue()
+        # 队列中尚未处理的 .dat 文件路径，解码时读取的是文件的最新内容，重复任务无需排队
+        self._pending_paths = set()
+
+    # 提交解码任务
+    def submit(self, dat_filepath, jpg_filepath):
+        if dat_filepath in self._pending_paths:
+            return
+        self._pending_paths.add(dat_filepath)
+        self._queue.put((dat_filepath, jpg_filepath))
 
     def run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            dat_filepath, jpg_filepath = job
+            self._pending_paths.discard(dat_filepath)
+            self.decode(dat_filepath, jpg_filepath)
+
+    def decode(self, dat_filepath, jpg_filepath):
         try:
             # 调用解码程序
             subprocess.run(
-                ["./ssdv", "-d", self.dat_filepath, self.jpg_filepath],
+                ["./ssdv", "-d", dat_filepath, jpg_filepath],
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
                 check=True,
                 creationflags=subprocess.CREATE_NO_WINDOW
             )
 
-            self.decoding_finished.emit(self.jpg_filepath)
+            self.decoding_finished.emit(jpg_filepath)
 
         except subprocess.CalledProcessError:
             self.log_message.emit("[错误] SSDV解码失败，程序返回错误。")
@@ -2086,6 +2377,104 @@ class SsdvDecoderThread(QThread):
             self.log_message.emit(f"[错误] SSDV解码线程出现未知异常: {e}")
             self.decoding_finished.emit("")
 
+    # 停止线程
+    def stop(self):
+        self._queue.put(None)
+        self.wait()
+
+# SondeHub 上传工作线程，由有界队列接收上传任务，避免在主线程中创建子进程
+class SondehubUploadThread(QThread):
+
+    # 定义信号，上传出错时发射，参数为日志信息
+    log_message = pyqtSignal(str)
+
+    def __init__(self, parent=None, maxsize=8, max_running=3, upload_timeout=30):
+        super().__init__(parent)
+        self.max_running = max_running
+        self.upload_timeout = upload_timeout
+        self._queue = queue.Queue(maxsize=maxsize)
+        # 队列中尚未处理的球上时间，用于丢弃重复的遥测帧
+        self._pending_times = set()
+        # 正在运行的上传进程及其启动时间，与停止标志一起由锁保护
+        self._processes = []
+        self._stopping = False
+        self._lock = threading.Lock()
+
+    # 提交上传任务，队列已满时返回 False
+    def submit(self, balloon_time, command_args) -> bool:
+        if balloon_time in self._pending_times:
+            return True
+        try:
+            self._queue.put_nowait((balloon_time, command_args))
+        except queue.Full:
+            return False
+        self._pending_times.add(balloon_time)
+        return True
+
+    def run(self):
+        while not self._stopping:
+            # 回收已结束的上传进程，同时运行的上传数达到上限时稍后再取新任务
+            self.reap_processes()
+            if len(self._processes) >= self.max_running:
+                self.msleep(100)
+                continue
+
+            # 仍有上传进行时限时等待，以便定期回收进程
+            try:
+                job = self._queue.get(timeout=0.5 if self._processes else None)
+            except queue.Empty:
+                continue
+            if job is None:
+                break
+            balloon_time, command_args = job
+            self._pending_times.discard(balloon_time)
+
+            # 在锁内检查停止标志并启动进程，确保 stop() 不会漏掉刚启动的进程
+            with self._lock:
+                if self._stopping:
+                    break
+                try:
+                    process = subprocess.Popen(command_args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, creationflags=subprocess.CREATE_NO_WINDOW)
+                except Exception as e:
+                    self.log_message.emit(f"SondeHub上传失败: {e}")
+                    continue
+                self._processes.append((process, monotonic()))
+
+        # 退出前终止仍在进行的上传
+        with self._lock:
+            for process, _ in self._processes:
+                process.kill()
+            self._processes = []
+
+    # 回收已结束的上传进程，终止超时的进程
+    def reap_processes(self):
+        now = monotonic()
+        with self._lock:
+            running = []
+            for process, started in self._processes:
+                if process.poll() is not None:
+                    continue
+                if now - started > self.upload_timeout:
+                    process.kill()
+                    self.log_message.emit("SondeHub上传超时，已终止本次上传。")
+                    continue
+                running.append((process, started))
+            self._processes = running
+
+    # 停止线程，丢弃尚未开始的上传并终止正在进行的上传
+    def stop(self):
+        with self._lock:
+            self._stopping = True
+            for process, _ in self._processes:
+                process.kill()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._queue.put(None)
+        self.wait()
+
 # 主事件
 if __name__ == '__main__':
 